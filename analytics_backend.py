@@ -0,0 +1,148 @@
+import re
+import threading
+import time
+
+import streamlit as st
+
+from db import run_query
+from instrumentation import record_query
+from snapshot import DIMENSION_TABLES, SNAPSHOT_TABLES, snapshot_enabled, snapshot_root, split_range
+
+try:
+    import duckdb
+except ImportError:  # backend analitik opsional, query tetap ke MySQL
+    duckdb = None
+
+# Backend analitik: query agregasi halaman dijalankan di DuckDB embedded di atas snapshot Parquet lokal
+# Katalog DuckDB meniru nama MySQL (skema sub_flight_db / sub_flight_db_2, nama tabel sama), sehingga
+# teks SQL yang sama bisa dijalankan di kedua backend. Query hanya dikirim ke DuckDB jika semua tanggalnya
+# sudah ada di snapshot; selain itu (mis. hari ini) dan jika DuckDB gagal, query berjalan di MySQL.
+BACKENDS = ["mysql", "duckdb"]
+
+
+def _analytics_settings():
+    return st.secrets.get("analytics", {})
+
+
+# Backend untuk satu halaman: [analytics.pages] "<nama halaman>" menimpa [analytics] backend
+def analytics_backend(page=None):
+    settings = _analytics_settings()
+    backend = settings.get("pages", {}).get(page, settings.get("backend", "mysql"))
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend analitik '{backend}' tidak dikenal (pilih: {', '.join(BACKENDS)}).")
+    if backend == "duckdb" and (duckdb is None or not snapshot_enabled()):
+        return "mysql"
+    return backend
+
+
+# Buat skema dan view DuckDB di atas file snapshot di `root` (susunan sama dengan snapshot.py)
+# Kolom dimensi hasil denormalisasi dibuang agar view sama persis dengan tabel MySQL
+def create_views(conn, root):
+    views = []
+    for table, spec in SNAPSHOT_TABLES.items():
+        if any((root / table).glob("*/*/*/*.parquet")):
+            excluded = ", ".join(spec["dimensions"])
+            files = f"{(root / table).as_posix()}/*/*/*/*.parquet"
+            views.append((spec["source"], f"SELECT * EXCLUDE ({excluded}) "
+                                          f"FROM read_parquet('{files}', hive_partitioning = false)"))
+    for source in DIMENSION_TABLES:
+        path = root / "dimensions" / f"{source}.parquet"
+        if path.exists():
+            views.append((source, f"SELECT * FROM read_parquet('{path.as_posix()}')"))
+
+    for source, select in views:
+        schema, name = source.split(".")
+        conn.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+        conn.execute(f"CREATE OR REPLACE VIEW {schema}.{name} AS {select}")
+    return [source for source, _ in views]
+
+
+# Koneksi DuckDB in-memory bersama semua sesi; setiap query memakai cursor sendiri
+@st.cache_resource
+def get_duckdb():
+    conn = duckdb.connect(database=":memory:")
+    create_views(conn, snapshot_root())
+    return conn
+
+
+# Placeholder pymysql menjadi placeholder DuckDB: %s -> ?, %(nama)s -> $nama, %% -> %
+def to_duckdb_sql(query):
+    def replace(match):
+        if match.group(1):
+            return f"${match.group(1)}"
+        return "?" if match.group(2) == "s" else "%"
+    return re.sub(r"%\((\w+)\)s|%(s|%)", replace, query).rstrip().rstrip(";")
+
+
+# Jalankan query di cursor DuckDB; tabel tanpa skema dicari di database default MySQL
+def run_duckdb(query, params=None, conn=None, default_schema=None):
+    cursor = (conn or get_duckdb()).cursor()
+    try:
+        schema = default_schema or st.secrets["mysql"]["database"]
+        cursor.execute(f"SET search_path = '{schema}'")
+        cursor.execute(to_duckdb_sql(query), dict(params) if isinstance(params, dict) else list(params or ()))
+        column_types = {column[0]: str(column[1]) for column in cursor.description}
+        df = cursor.df()
+    finally:
+        cursor.close()
+    # DATE dikembalikan sebagai objek date seperti hasil pymysql
+    for column, column_type in column_types.items():
+        if column_type == "DATE":
+            df[column] = df[column].dt.date
+    return df
+
+
+# Jumlah query per backend dan fallback ke MySQL, bersama semua sesi
+@st.cache_resource
+def _analytics_counters():
+    return {"lock": threading.Lock(), "duckdb": 0, "mysql": 0, "fallbacks": 0, "last_error": None}
+
+
+def _count(key, error=None):
+    counters = _analytics_counters()
+    with counters["lock"]:
+        counters[key] += 1
+        if error is not None:
+            counters["last_error"] = str(error)
+
+
+# Tabel snapshot yang dibaca query (dicocokkan dari nama tabel di teks SQL)
+def _snapshot_tables(query):
+    return [table for table in SNAPSHOT_TABLES if re.search(rf"\b{table}\b", query)]
+
+
+# Semua tanggal (`dates` seperti pada run_query) sudah ada di snapshot untuk setiap tabel yang dibaca
+def snapshot_covers(query, dates):
+    tables = _snapshot_tables(query)
+    if not dates or not tables:
+        return False
+    for value in dates:
+        start, end = value if isinstance(value, (tuple, list)) else (value, value)
+        for table in tables:
+            if split_range(table, start, end)[1]:
+                return False
+    return True
+
+
+# Jalankan query agregasi halaman `page` di backend yang dipilih; hasil sama dengan run_query
+# Tanpa `dates` atau jika ada tanggal yang belum ada di snapshot, query berjalan di MySQL
+def run_analytics(query, params=None, dates=None, page=None):
+    if analytics_backend(page) == "duckdb" and snapshot_covers(query, dates):
+        try:
+            started = time.perf_counter()
+            df = run_duckdb(query, params)
+            record_query(query, time.perf_counter() - started, df, "duckdb")
+            _count("duckdb")
+            return df
+        except duckdb.Error as e:
+            # Mis. tabel yang tidak ada di snapshot; MySQL tetap sumber kebenaran
+            _count("fallbacks", e)
+    _count("mysql")
+    return run_query(query, params, dates=dates)
+
+
+def analytics_stats():
+    counters = _analytics_counters()
+    with counters["lock"]:
+        stats = {key: value for key, value in counters.items() if key != "lock"}
+    return {"backend": analytics_backend(), **stats}
@@ -1,7 +1,16 @@
 import streamlit as st
 import pandas as pd
-import pymysql
 import re
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from analytics_backend import analytics_stats
+from db import connection, pool_stats, single_flight_stats
+from ingest import required_files, file_template, run_pipeline, default_workers
+from bulk_load import STRATEGIES, DEFAULT_STRATEGY, DEFAULT_BATCH_SIZE
+from ledger import ensure_ledger_table, file_hash, has_source_column, ledger_status, load_branch, STATUS_DONE
+from query_cache import cache_stats, clear_cache, invalidate
+from rollup import ensure_rollup_table, refresh_after_ingest
 
 # Konfigurasi halaman
 st.set_page_config(
@@ -11,117 +20,195 @@ st.set_page_config(
     initial_sidebar_state="auto",
 )
 
-# Template nama file dan mapping kolom
-required_files = ["WARE", "WARR", "WARW", "WARC", "WARD", "WADY", "WARA", "WART"]
-file_template = r"\(Data Movement Cabang (\w+)\) .+\.(xls|xlsx)"
-column_mapping = [
-    "TANGGAL", "ACID", "A_REG", "A_TYPE", "ADEP", "ADES", "EOBT", "PUSHBACK", "TAXI",
-    "DEP_ARR_LOCAL", "ATD", "ETA", "ATA", "RIU", "POB", "REMARK", "STATUS_FLIGHT"
-]
-
 st.title("Halaman Upload File")
 
-# Fungsi untuk mendapatkan koneksi database MySQL
-def get_db_connection():
-    try:
-        secrets = st.secrets["mysql"]
-        conn = pymysql.connect(
-            host=secrets["host"],
-            user=secrets["username"],
-            password=secrets["password"],
-            database=secrets["database"],
-            port=secrets["port"]
-        )
-        return conn
-    except pymysql.MySQLError as e:
-        st.error(f"Koneksi MySQL gagal: {e}")
-        return None
-
-# Fungsi untuk membaca file Excel
-@st.cache_data
-def read_excel_file(uploaded_file):
-    try:
-        data = pd.read_excel(uploaded_file, skiprows=6, engine="openpyxl", header=None)
-        data = data.iloc[:, 1:]  # Hapus kolom pertama
-        if len(data.columns) != len(column_mapping):
-            raise ValueError(
-                f"Jumlah kolom di file Excel ({len(data.columns)}) tidak sesuai dengan yang diharapkan ({len(column_mapping)})."
-            )
-        data.columns = column_mapping
-        return data
-    except Exception as e:
-        raise ValueError(f"Kesalahan saat membaca file Excel: {e}")
-
-# Fungsi untuk membersihkan dan menyesuaikan data
-def clean_data(data):
-    # Konversi kolom `TANGGAL` ke format DATE
-    if "TANGGAL" in data.columns:
-        data["TANGGAL"] = pd.to_datetime(data["TANGGAL"], errors="coerce").dt.date
-
-    # # Pastikan kolom waktu dalam format `HH:MM:SS`
-    # time_columns = ["EOBT", "PUSHBACK", "TAXI", "ATD", "ETA", "ATA"]
-    # for col in time_columns:
-    #     if col in data.columns:
-    #         data[col] = pd.to_datetime(data[col], format="%H:%M:%S", errors="coerce").dt.time
-
-    # Ganti semua NaN dengan None untuk MySQL
-    data = data.where(pd.notnull(data), None)
-
-    # Pastikan semua nilai diubah menjadi tipe Python-native
-    for col in data.columns:
-        if data[col].dtype == "float64":
-            data[col] = data[col].astype(object).where(pd.notnull(data[col]), None)
-        elif data[col].dtype == "int64":
-            data[col] = data[col].astype(object).where(pd.notnull(data[col]), None)
-        elif data[col].dtype == "datetime64[ns]":
-            data[col] = data[col].astype(str).where(pd.notnull(data[col]), None)
-        else:
-            data[col] = data[col].where(pd.notnull(data[col]), None)
-    return data
-
-# Fungsi untuk menyimpan data ke MySQL
-def insert_data(conn, table_name, data):
-    try:
-        placeholders = ", ".join(["%s" for _ in data.columns])
-        query = f"INSERT INTO {table_name} ({', '.join(data.columns)}) VALUES ({placeholders})"
-
-        values = [tuple(row) for row in data.itertuples(index=False, name=None)]
-
-        with conn.cursor() as cursor:
-            cursor.executemany(query, values)
-        conn.commit()
-    except pymysql.MySQLError as e:
-        raise ValueError(f"Kesalahan saat menyimpan ke database: {e}")
+# Process pool untuk parsing Excel, dipakai ulang di semua rerun dan sesi
+@st.cache_resource
+def get_parse_executor():
+    return ProcessPoolExecutor(
+        max_workers=default_workers(len(required_files)),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+# Tabel ledger dan rollup cukup dipastikan sekali per proses server
+@st.cache_resource
+def init_tables():
+    with connection() as conn:
+        ensure_ledger_table(conn)
+        ensure_rollup_table(conn)
+    return True
+
+# Kolom asal flights ditambahkan lewat migrasi; tanpa kolom itu upload gagal di tengah jalan
+def source_column_ready():
+    with connection() as conn:
+        return has_source_column(conn, "flights")
+
+# Label status per tahap pipeline
+stage_labels = {
+    "waiting": "Menunggu",
+    "parsing": "Membaca file",
+    "writing": "Menyimpan ke database",
+    "done": "Selesai",
+    "error": "Gagal",
+}
+
+# Mode pembacaan: paralel (cepat) atau streaming per chunk (memori konstan untuk file besar)
+read_mode = st.sidebar.radio(
+    "Mode pembacaan file",
+    options=["parallel", "stream"],
+    format_func=lambda mode: "Paralel" if mode == "parallel" else "Streaming (hemat memori)",
+)
 
-# Loop untuk memproses file yang diunggah
+# Pengaturan bulk load ke tabel flights
+# LOAD DATA LOCAL INFILE hanya ditawarkan jika koneksi mengizinkannya ([mysql] local_infile = true)
+strategy_options = [
+    strategy for strategy in STRATEGIES
+    if strategy != "load_data" or st.secrets["mysql"].get("local_infile", False)
+]
+with st.sidebar.expander("Pengaturan penyimpanan"):
+    load_strategy = st.selectbox(
+        "Strategi bulk load",
+        options=strategy_options,
+        index=strategy_options.index(DEFAULT_STRATEGY),
+        format_func=STRATEGIES.get,
+    )
+    batch_size = st.number_input("Ukuran batch", min_value=100, max_value=100_000,
+                                 value=DEFAULT_BATCH_SIZE, step=500)
+    replace_mode = st.checkbox(
+        "Mode ganti: hapus lalu muat ulang data cabang pada tanggal di file",
+        help="Gunakan untuk memperbaiki data cabang/hari yang sudah pernah diunggah.",
+    )
+
+init_tables()
+if not source_column_ready():
+    st.error("Kolom SOURCE_CABANG belum ada di tabel flights. Jalankan `python migrations.py migrate` terlebih dahulu.")
+    st.stop()
+
+# Loop untuk memvalidasi file yang diunggah
+# File yang sudah tercatat di ledger dilewati, sehingga rerun Streamlit tidak memasukkan data dua kali
+pending_files = []
+uploads = {}
+# File yang sudah diproses di sesi ini tidak diproses lagi, termasuk pada mode ganti
+ingested_in_session = st.session_state.setdefault("ingested_files", set())
 for file_key in required_files:
     uploaded_file = st.file_uploader(f"Unggah file '{file_key}'", type=["xlsx", "xls"], key=file_key)
-    
+
     if uploaded_file is not None:
-        try:
-            match = re.match(file_template, uploaded_file.name)
-            if not match:
-                st.error(f"Nama file '{uploaded_file.name}' tidak sesuai template.")
-                continue
-
-            cabang_name = match.group(1)
-            if cabang_name != file_key:
-                st.error(f"File '{uploaded_file.name}' bukan untuk cabang {file_key}. Harap unggah file yang sesuai.")
-                continue
-
-            data = read_excel_file(uploaded_file)
-            data = clean_data(data)
-
-            with get_db_connection() as conn:
-                if conn:
-                    try:
-                        insert_data(conn, "flights", data)
-                        st.success(f"Data untuk cabang {file_key} berhasil disimpan ke database!")
-                    except Exception as e:
-                        st.error(f"Kesalahan saat menyimpan ke database: {e}")
-        except ValueError as ve:
-            st.error(f"Kesalahan saat memproses file {uploaded_file.name}: {ve}")
-        except Exception as e:
-            st.error(f"Kesalahan tak terduga: {e}")
+        match = re.match(file_template, uploaded_file.name)
+        if not match:
+            st.error(f"Nama file '{uploaded_file.name}' tidak sesuai template.")
+            continue
+
+        cabang_name = match.group(1)
+        if cabang_name != file_key:
+            st.error(f"File '{uploaded_file.name}' bukan untuk cabang {file_key}. Harap unggah file yang sesuai.")
+            continue
+
+        content = uploaded_file.getvalue()
+        content_hash = file_hash(content)
+        if (content_hash, file_key) in ingested_in_session:
+            st.info(f"File '{uploaded_file.name}' sudah diproses di sesi ini.")
+            continue
+        with connection() as conn:
+            status = ledger_status(conn, content_hash, file_key)
+        if status == STATUS_DONE and not replace_mode:
+            st.info(f"File '{uploaded_file.name}' sudah pernah disimpan untuk cabang {file_key}, dilewati.")
+            continue
+
+        # File yang sebelumnya gagal di tengah jalan selalu dimuat ulang dengan mode ganti
+        uploads[file_key] = {
+            "name": uploaded_file.name,
+            "hash": content_hash,
+            "replace": replace_mode or status is not None,
+        }
+        pending_files.append((file_key, content))
     else:
-        st.info(f"File {file_key} belum diunggah.")
\ No newline at end of file
+        st.info(f"File {file_key} belum diunggah.")
+
+# Proses semua cabang yang diunggah: parsing paralel, penyimpanan tumpang tindih dengan parsing
+if pending_files:
+    st.subheader("Progres Upload")
+    progress_bar = st.progress(0)
+    status_table = st.empty()
+    progress = {
+        file_key: {"CABANG": file_key, "STATUS": stage_labels["waiting"], "BARIS": None,
+                   "PARSE (s)": None, "CLEAN (s)": None, "SIMPAN (s)": None, "BARIS/DETIK": None,
+                   "RETRY": 0, "PESAN": ""}
+        for file_key, _ in pending_files
+    }
+
+    def on_event(file_key, stage, info):
+        row = progress[file_key]
+        row["STATUS"] = stage_labels[stage]
+        if "rows" in info:
+            row["BARIS"] = info["rows"]
+        for key, column in (("parse", "PARSE (s)"), ("clean", "CLEAN (s)"), ("write", "SIMPAN (s)")):
+            if key in info:
+                row[column] = round(info[key], 2)
+        if "write" in info and info.get("rows"):
+            row["BARIS/DETIK"] = round(info["rows"] / info["write"]) if info["write"] else None
+        if "error" in info:
+            row["PESAN"] = info["error"]
+        finished = sum(r["STATUS"] in (stage_labels["done"], stage_labels["error"]) for r in progress.values())
+        progress_bar.progress(finished / len(progress))
+        status_table.dataframe(pd.DataFrame(list(progress.values())))
+
+    # Simpan satu cabang dan catat di ledger
+    def write_branch(file_key, chunks):
+        upload = uploads[file_key]
+        refreshed = None
+        try:
+            with connection() as conn:
+                result = load_branch(
+                    conn, "flights", file_key, upload["hash"], upload["name"], chunks,
+                    replace=upload["replace"], strategy=load_strategy, batch_size=int(batch_size),
+                )
+                progress[file_key]["RETRY"] = result["retries"]
+                # Rollup harian diperbarui hanya untuk tanggal yang ada di file
+                try:
+                    refreshed = refresh_after_ingest(conn, result["dates"])
+                except Exception as e:
+                    progress[file_key]["PESAN"] = f"Rollup belum diperbarui: {e}"
+                # Snapshot Parquet tidak disentuh: snapshot flights diekspor dari sub_flight_db.flights,
+                # sedangkan upload ini menulis ke flights di database secrets
+        finally:
+            # Buang hasil query yang membaca tanggal tersebut; tanpa daftar tanggal (gagal) seluruh cache dibuang
+            invalidate(refreshed)
+
+    status_table.dataframe(pd.DataFrame(list(progress.values())))
+    try:
+        results = run_pipeline(
+            pending_files, write_branch, on_event=on_event,
+            executor=get_parse_executor() if read_mode == "parallel" else None,
+            mode=read_mode,
+        )
+    except Exception as e:
+        st.error(f"Kesalahan tak terduga: {e}")
+        results = {}
+
+    # Pool yang rusak tidak bisa dipakai lagi; upload berikutnya memakai pool baru
+    if any(result.get("pool_broken") for result in results.values()):
+        get_parse_executor.clear()
+        st.warning("Proses parsing paralel berhenti tiba-tiba; file yang tersisa dibaca dengan mode streaming.")
+
+    for file_key, result in results.items():
+        if result["status"] == "done":
+            ingested_in_session.add((uploads[file_key]["hash"], file_key))
+            st.success(f"Data untuk cabang {file_key} berhasil disimpan ke database!")
+        else:
+            st.error(f"Kesalahan saat memproses file cabang {file_key}: {result['error']}")
+
+# Statistik pool koneksi (waktu tunggu, koneksi aktif/idle) dan query identik yang dibagi antar sesi
+with st.sidebar.expander("Koneksi database"):
+    st.json(pool_stats())
+    st.json(single_flight_stats())
+
+# Statistik cache query bersama (hit/miss/eviction)
+with st.sidebar.expander("Cache query"):
+    if st.button("Kosongkan cache"):
+        clear_cache()
+    st.json(cache_stats())
+
+# Backend analitik yang aktif dan jumlah query per backend
+with st.sidebar.expander("Backend analitik"):
+    st.json(analytics_stats())
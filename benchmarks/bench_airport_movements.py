@@ -0,0 +1,56 @@
+# Benchmark hitung movement Infografis harian: loop iterrows lama vs airport_movement_counts
+# Kesamaan hasil diperiksa di tests/test_traffic.py
+# Jalankan dari root repo: python benchmarks/bench_airport_movements.py [jumlah_baris]
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from traffic import airport_movement_counts  # noqa: E402
+
+airports = ["WARR", "WARW", "WARD", "WART", "WADY", "WAWR", "WAOO"]
+
+
+def make_synthetic(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = np.array(airports + ["WIII", "WADD", "WSSS", None], dtype=object)
+    return pd.DataFrame({
+        "ADEP": rng.choice(codes, n_rows),
+        "ADES": rng.choice(codes, n_rows),
+        "STATUS_FLIGHT": rng.choice(np.array(["REGULER", "CHARTER", "CARGO", "MILITARY", None], dtype=object), n_rows),
+        "DEP_ARR_LOCAL": rng.choice(np.array(["D", "A", "L", None], dtype=object), n_rows),
+    })
+
+
+# Implementasi lama dari pages/Infografis harian.py
+def legacy_counts(df):
+    movement_data = {icao: {"REGULER": 0, "IRREGULER": 0, "TOTAL": 0} for icao in airports}
+    for _, row in df.iterrows():
+        locations = [row["ADEP"], row["ADES"]]
+        for loc in locations:
+            if loc in movement_data:
+                category = "REGULER" if row["STATUS_FLIGHT"] == "REGULER" else "IRREGULER"
+                movement_data[loc][category] += 1
+                movement_data[loc]["TOTAL"] += 1
+                if row["DEP_ARR_LOCAL"] == "L":
+                    movement_data[loc][category] += 1
+                    movement_data[loc]["TOTAL"] += 1
+    return movement_data
+
+
+def new_counts(df):
+    return airport_movement_counts(df, airports).to_dict(orient="index")
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = make_synthetic(n_rows)
+    print(f"{n_rows} baris sintetis")
+    for name, func in (("lama", legacy_counts), ("baru", new_counts)):
+        started = time.perf_counter()
+        func(df)
+        print(f"{name:<6} {time.perf_counter() - started:>8.2f} detik")
@@ -0,0 +1,195 @@
+# Benchmark + cek hasil backend analitik: query halaman yang sama di DuckDB (snapshot Parquet) vs MySQL
+# Data sintetis ditulis dengan susunan snapshot (flights/year=/month=/day=/part-0.parquet) di folder sementara.
+# Tanpa --mysql hasil DuckDB dicocokkan dengan agregasi pyarrow (sepenuhnya offline);
+# dengan --mysql data yang sama dimuat ke tabel bench_flights di database [mysql] lalu dibandingkan.
+# Jalankan dari root repo: python benchmarks/bench_analytics_backend.py [jumlah_baris] [--mysql]
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics_backend import create_views, run_duckdb  # noqa: E402
+from yoy import daily_movements_sql, year_ranges  # noqa: E402
+
+YEARS = [2023, 2024, 2025]
+AIRPORTS = np.array(["WARR", "WARW", "WARD", "WART", "WADY", "WAWR", "WAOO", "WIII", "WADD", "WSSS"], dtype=object)
+COUNTRIES = np.array(["INDONESIA"] * 9 + ["SINGAPORE"], dtype=object)
+AIRLINES = np.array(["GIA", "LNI", "CTV", "BTK", "SJY", "AWQ"], dtype=object)
+STATUSES = np.array(["REGULER", "CHARTER", "CARGO", "MILITARY"], dtype=object)
+DIRECTIONS = np.array(["D", "A", "L"], dtype=object)
+
+# Agregasi rentang panjang per bandara asal dan status (pola Infografis harian)
+AIRPORT_SQL = """
+    SELECT ADEP, STATUS_FLIGHT, SUM(CASE WHEN DEP_ARR_LOCAL = 'L' THEN 2 ELSE 1 END) AS total_movement
+    FROM {table}
+    WHERE tanggal_dummy BETWEEN %s AND %s
+    GROUP BY ADEP, STATUS_FLIGHT
+    ORDER BY ADEP, STATUS_FLIGHT
+"""
+
+
+# Tulis n_rows baris flights sintetis, tersebar rata di semua hari YEARS, satu file per hari
+def write_synthetic(root, n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    days = pd.date_range(date(YEARS[0], 1, 1), date(YEARS[-1], 12, 31)).date
+    per_day = np.full(len(days), n_rows // len(days))
+    per_day[: n_rows % len(days)] += 1
+    for day, count in zip(days, per_day):
+        adep = rng.integers(0, len(AIRPORTS), count)
+        ades = rng.integers(0, len(AIRPORTS), count)
+        airline = rng.integers(0, len(AIRLINES), count)
+        table = pa.table({
+            "tanggal_dummy": pa.array([day] * count, type=pa.date32()),
+            "ADEP": AIRPORTS[adep].tolist(),
+            "ADES": AIRPORTS[ades].tolist(),
+            "STATUS_FLIGHT": STATUSES[rng.integers(0, len(STATUSES), count)].tolist(),
+            "DEP_ARR_LOCAL": DIRECTIONS[rng.integers(0, len(DIRECTIONS), count)].tolist(),
+            "ICAO_CODE": AIRLINES[airline].tolist(),
+            "DEP_COUNTRY": COUNTRIES[adep].tolist(),
+            "ARR_COUNTRY": COUNTRIES[ades].tolist(),
+            "AIRLINE_NAME": AIRLINES[airline].tolist(),
+        })
+        target = root / "flights" / f"year={day.year}" / f"month={day.month:02}" / f"day={day.day:02}"
+        target.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table, target / "part-0.parquet")
+
+
+def _weighted(table):
+    return table.append_column(
+        "weight", pc.if_else(pc.equal(table["DEP_ARR_LOCAL"], "L"), 2, 1).cast(pa.int64())
+    )
+
+
+# Hasil acuan dengan pyarrow langsung dari file
+def reference_daily(root, ranges, status):
+    dataset = ds.dataset(str(root / "flights"), format="parquet")
+    in_ranges = None
+    for start, end in ranges:
+        predicate = (ds.field("tanggal_dummy") >= start) & (ds.field("tanggal_dummy") <= end)
+        in_ranges = predicate if in_ranges is None else in_ranges | predicate
+    table = dataset.to_table(
+        columns=["tanggal_dummy", "DEP_ARR_LOCAL"], filter=(ds.field("STATUS_FLIGHT") == status) & in_ranges
+    )
+    grouped = _weighted(table).group_by("tanggal_dummy").aggregate([("weight", "sum")])
+    return grouped.rename_columns(["tanggal_dummy", "total_movement"]).to_pandas()
+
+
+def reference_airports(root, start, end):
+    dataset = ds.dataset(str(root / "flights"), format="parquet")
+    table = dataset.to_table(
+        columns=["ADEP", "STATUS_FLIGHT", "DEP_ARR_LOCAL"],
+        filter=(ds.field("tanggal_dummy") >= start) & (ds.field("tanggal_dummy") <= end),
+    )
+    grouped = _weighted(table).group_by(["ADEP", "STATUS_FLIGHT"]).aggregate([("weight", "sum")])
+    return grouped.rename_columns(["ADEP", "STATUS_FLIGHT", "total_movement"]).to_pandas()
+
+
+# Bandingkan dua hasil setelah urutan, tipe tanggal, dan tipe angka disamakan
+def same_result(left, right, keys):
+    def normalize(df):
+        df = df[keys + ["total_movement"]].copy()
+        for key in keys:
+            df[key] = df[key].astype(str)
+        df["total_movement"] = df["total_movement"].astype("int64")
+        return df.sort_values(keys).reset_index(drop=True)
+    return normalize(left).equals(normalize(right))
+
+
+def timed(label, func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label}: {best:.3f} detik (terbaik dari {repeat})")
+    return result
+
+
+# Muat data sintetis ke MySQL (tabel bench_flights) per hari
+def load_mysql(conn, root):
+    with conn.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS bench_flights")
+        cursor.execute("""
+            CREATE TABLE bench_flights (
+                tanggal_dummy DATE, ADEP VARCHAR(4), ADES VARCHAR(4), STATUS_FLIGHT VARCHAR(16),
+                DEP_ARR_LOCAL VARCHAR(1), ICAO_CODE VARCHAR(3),
+                INDEX idx_tanggal (tanggal_dummy)
+            )
+        """)
+        for path in sorted((root / "flights").glob("*/*/*/part-0.parquet")):
+            table = pq.read_table(path, columns=["tanggal_dummy", "ADEP", "ADES", "STATUS_FLIGHT", "DEP_ARR_LOCAL",
+                                                 "ICAO_CODE"])
+            cursor.executemany(
+                "INSERT INTO bench_flights VALUES (%s, %s, %s, %s, %s, %s)",
+                list(zip(*[column.to_pylist() for column in table.columns])),
+            )
+    conn.commit()
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--mysql"]
+    n_rows = int(args[0]) if args else 10_000_000
+    with_mysql = "--mysql" in sys.argv
+
+    root = Path(tempfile.mkdtemp(prefix="bench_snapshot_"))
+    try:
+        started = time.perf_counter()
+        write_synthetic(root, n_rows)
+        print(f"{n_rows:,} baris sintetis ditulis dalam {time.perf_counter() - started:.1f} detik")
+
+        conn = duckdb.connect(database=":memory:")
+        create_views(conn, root)
+
+        ranges = [(start, end) for _, start, end in year_ranges(YEARS, month=3)]
+        daily_params = ["REGULER"] + [value for start_end in ranges for value in start_end]
+        airport_params = [date(YEARS[-1], 1, 1), date(YEARS[-1], 12, 31)]
+
+        duck_daily = timed("DuckDB YoY harian", lambda: run_duckdb(
+            daily_movements_sql(len(ranges)), daily_params, conn=conn, default_schema="sub_flight_db"))
+        duck_airports = timed("DuckDB agregasi bandara 1 tahun", lambda: run_duckdb(
+            AIRPORT_SQL.format(table="sub_flight_db.flights"), airport_params, conn=conn,
+            default_schema="sub_flight_db"))
+
+        if not same_result(duck_daily, reference_daily(root, ranges, "REGULER"), ["tanggal_dummy"]) \
+                or not same_result(duck_airports, reference_airports(root, *airport_params), ["ADEP", "STATUS_FLIGHT"]):
+            print("GAGAL: hasil DuckDB berbeda dengan acuan pyarrow")
+            sys.exit(1)
+        print("Hasil DuckDB identik dengan acuan pyarrow")
+
+        if with_mysql:
+            from db import connection
+
+            with connection() as mysql_conn:
+                started = time.perf_counter()
+                load_mysql(mysql_conn, root)
+                print(f"Data dimuat ke MySQL dalam {time.perf_counter() - started:.1f} detik")
+                try:
+                    mysql_daily = timed("MySQL YoY harian", lambda: pd.read_sql(
+                        daily_movements_sql(len(ranges), table="bench_flights"), mysql_conn, params=daily_params))
+                    mysql_airports = timed("MySQL agregasi bandara 1 tahun", lambda: pd.read_sql(
+                        AIRPORT_SQL.format(table="bench_flights"), mysql_conn, params=airport_params))
+                    if not same_result(duck_daily, mysql_daily, ["tanggal_dummy"]) \
+                            or not same_result(duck_airports, mysql_airports, ["ADEP", "STATUS_FLIGHT"]):
+                        print("GAGAL: hasil DuckDB berbeda dengan MySQL")
+                        sys.exit(1)
+                    print("Hasil DuckDB identik dengan MySQL")
+                finally:
+                    with mysql_conn.cursor() as cursor:
+                        cursor.execute("DROP TABLE IF EXISTS bench_flights")
+                    mysql_conn.commit()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
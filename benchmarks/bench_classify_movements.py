@@ -0,0 +1,93 @@
+# Benchmark klasifikasi traffic Data Realisasi: count_movements per baris vs classify_movements
+# Kesamaan hasil diperiksa di tests/test_traffic.py
+# Jalankan dari root repo: python benchmarks/bench_classify_movements.py [jumlah_baris]
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from traffic import classify_movements  # noqa: E402
+
+
+def make_synthetic(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = np.array(["WARR", "WARR", "WIII", "WADD", "WSSS", "WMKK"], dtype=object)
+    countries = np.array(["Domestik", " Domestik ", "International", "International "], dtype=object)
+    statuses = np.array(["REGULER", "REGULER", "POSITIONING", "EXTRA", "VIP", "CHARTER", "CARGO", "MILITARY", None],
+                        dtype=object)
+    airlines = np.array(["Garuda Indonesia", "Lion Air", "Citilink", "Batik Air", None], dtype=object)
+    return pd.DataFrame({
+        "ADEP": rng.choice(codes, n_rows),
+        "ADES": rng.choice(codes, n_rows),
+        "STATUS_FLIGHT": rng.choice(statuses, n_rows),
+        "DEP_ARR_LOCAL": rng.choice(np.array(["D", "A", "L"], dtype=object), n_rows),
+        "DEP_COUNTRY": rng.choice(countries, n_rows),
+        "ARR_COUNTRY": rng.choice(countries, n_rows),
+        "AIRLINE_NAME": rng.choice(airlines, n_rows),
+    })
+
+
+# Implementasi lama dari pages/Data Realisasi.py
+def legacy_classify(data):
+    movement_data = {"SCHEDULE": {}, "UNSCHEDULE": {}, "MILITARY": {}}
+    schedule_keterangan = {}
+    unschedule_keterangan = {"POSITIONING": 0, "CARGO": 0, "CHARTER": 0, "EXTRA": 0, "VIP": 0}
+
+    def count_movements(row, movement_type):
+        adep, ades = row["ADEP"], row["ADES"]
+        dep_country, arr_country = row["DEP_COUNTRY"], row["ARR_COUNTRY"]
+        counts = movement_data[movement_type]
+        if adep == "WARR" and ades == "WARR":
+            counts["DOM_DEP"] = counts.get("DOM_DEP", 0) + 1
+            counts["DOM_ARR"] = counts.get("DOM_ARR", 0) + 1
+            return
+        if adep == "WARR" and arr_country.strip() == "Domestik":
+            counts["DOM_DEP"] = counts.get("DOM_DEP", 0) + 1
+        if ades == "WARR" and dep_country.strip() == "Domestik":
+            counts["DOM_ARR"] = counts.get("DOM_ARR", 0) + 1
+        if adep == "WARR" and arr_country.strip() == "International":
+            counts["INT_DEP"] = counts.get("INT_DEP", 0) + 1
+        if ades == "WARR" and dep_country.strip() == "International":
+            counts["INT_ARR"] = counts.get("INT_ARR", 0) + 1
+
+    for _, row in data.iterrows():
+        status = row["STATUS_FLIGHT"]
+        if status == "REGULER":
+            count_movements(row, "SCHEDULE")
+            airline_name = row["AIRLINE_NAME"]
+            schedule_keterangan[airline_name] = schedule_keterangan.get(airline_name, 0) + 1
+            if row["DEP_ARR_LOCAL"] == "L":
+                schedule_keterangan[airline_name] = schedule_keterangan.get(airline_name, 0) + 1
+        elif status in ["POSITIONING", "EXTRA", "VIP", "CHARTER", "CARGO"]:
+            count_movements(row, "UNSCHEDULE")
+            unschedule_keterangan[status] += 1
+            if row["DEP_ARR_LOCAL"] == "L":
+                unschedule_keterangan[status] += 1
+        else:
+            count_movements(row, "MILITARY")
+
+    matrix = {
+        movement_type: {key: counts.get(key, 0) for key in ["DOM_DEP", "DOM_ARR", "INT_DEP", "INT_ARR"]}
+        for movement_type, counts in movement_data.items()
+    }
+    return matrix, schedule_keterangan, unschedule_keterangan
+
+
+def new_classify(data):
+    matrix, schedule_keterangan, unschedule_keterangan = classify_movements(data, airport="WARR")
+    return matrix.to_dict(orient="index"), schedule_keterangan, unschedule_keterangan
+
+
+if __name__ == "__main__":
+    # Satu bulan data WARR berkisar puluhan ribu baris; ukur juga di atasnya
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    data = make_synthetic(n_rows)
+    print(f"{n_rows} baris sintetis")
+    for name, func in (("lama", legacy_classify), ("baru", new_classify)):
+        started = time.perf_counter()
+        func(data)
+        print(f"{name:<6} {time.perf_counter() - started:>8.2f} detik")
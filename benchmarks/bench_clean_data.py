@@ -0,0 +1,86 @@
+# Benchmark clean_data: implementasi lama (where berulang + itertuples) vs konversi per kolom
+# Kesamaan hasil diperiksa di tests/test_ingest.py
+# Jalankan dari root repo: python benchmarks/bench_clean_data.py [jumlah_baris]
+import os
+import sys
+import time
+import tracemalloc
+from datetime import time as dtime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingest import clean_data, column_mapping  # noqa: E402
+
+
+# Data sintetis yang menyerupai hasil pd.read_excel satu file cabang
+def make_synthetic(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    airports = np.array(["WARR", "WARW", "WARD", "WART", "WADY", "WIII", "WADD", "WSSS"])
+    times = np.array([dtime(h, m) for h in range(24) for m in range(0, 60, 5)], dtype=object)
+
+    def sparse_times():
+        values = rng.choice(times, n_rows)
+        values[rng.random(n_rows) < 0.1] = None
+        return values
+
+    pob = rng.integers(0, 300, n_rows).astype(float)
+    pob[rng.random(n_rows) < 0.05] = np.nan
+    return pd.DataFrame({
+        "TANGGAL": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 31, n_rows), unit="D"),
+        "ACID": np.char.add("GIA", rng.integers(100, 999, n_rows).astype(str)),
+        "A_REG": np.char.add("PK-", rng.integers(100, 999, n_rows).astype(str)),
+        "A_TYPE": rng.choice(["B738", "A320", "AT76"], n_rows),
+        "ADEP": rng.choice(airports, n_rows),
+        "ADES": rng.choice(airports, n_rows),
+        "EOBT": sparse_times(),
+        "PUSHBACK": sparse_times(),
+        "TAXI": sparse_times(),
+        "DEP_ARR_LOCAL": rng.choice(["D", "A", "L"], n_rows),
+        "ATD": sparse_times(),
+        "ETA": sparse_times(),
+        "ATA": sparse_times(),
+        "RIU": rng.choice(["R", "I", "U", None], n_rows),
+        "POB": pob,
+        "REMARK": rng.choice(["", "DELAY", None], n_rows),
+        "STATUS_FLIGHT": rng.choice(["REGULER", "CHARTER", "CARGO", "MILITARY"], n_rows),
+    })[column_mapping]
+
+
+# Implementasi clean_data sebelum perubahan, ditambah pembuatan tuple dari insert_data lama
+def legacy_clean_rows(data):
+    if "TANGGAL" in data.columns:
+        data["TANGGAL"] = pd.to_datetime(data["TANGGAL"], errors="coerce").dt.date
+    data = data.where(pd.notnull(data), None)
+    for col in data.columns:
+        if data[col].dtype == "float64":
+            data[col] = data[col].astype(object).where(pd.notnull(data[col]), None)
+        elif data[col].dtype == "int64":
+            data[col] = data[col].astype(object).where(pd.notnull(data[col]), None)
+        elif data[col].dtype == "datetime64[ns]":
+            data[col] = data[col].astype(str).where(pd.notnull(data[col]), None)
+        else:
+            data[col] = data[col].where(pd.notnull(data[col]), None)
+    return [tuple(row) for row in data.itertuples(index=False, name=None)]
+
+
+def measure(func, data):
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows = func(data.copy())
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, elapsed, peak
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    data = make_synthetic(n_rows)
+    print(f"{n_rows} baris sintetis")
+    print(f"{'versi':<8} {'detik':>8} {'baris/detik':>14} {'memori puncak (MB)':>20}")
+    for name, func in (("lama", legacy_clean_rows), ("baru", clean_data)):
+        rows, elapsed, peak = measure(func, data)
+        print(f"{name:<8} {elapsed:>8.2f} {len(rows) / elapsed:>14,.0f} {peak / 2**20:>20.1f}")
@@ -0,0 +1,101 @@
+# Benchmark konversi ATD/ATA dan ETD/ETA: convert_to_time per baris (.apply) vs time_utils
+# Kesamaan hasil diperiksa di tests/test_time_utils.py
+# Jalankan dari root repo: python benchmarks/bench_time_conversion.py [jumlah_baris]
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from time_utils import to_hhmm, to_timestamps  # noqa: E402
+
+
+# Implementasi lama dari pages/Data Realisasi.py
+def legacy_convert_to_time(reference_time, value):
+    if pd.isna(value):
+        return None
+    if isinstance(value, str):
+        if "minute" in value:
+            return reference_time + timedelta(minutes=int(value.split()[0]))
+        elif "hour" in value:
+            return reference_time + timedelta(hours=int(value.split()[0]))
+        elif "day" in value:
+            return reference_time + timedelta(days=int(value.split()[0]))
+        return None
+    elif isinstance(value, pd.Timedelta):
+        return reference_time + value
+    return None
+
+
+# Implementasi lama dari pages/Data Planning.py
+def legacy_hhmm(timedelta_obj):
+    try:
+        total_seconds = timedelta_obj.total_seconds()
+        return f"{int(total_seconds // 3600):02}:{int((total_seconds % 3600) // 60):02}"
+    except Exception:
+        return None
+
+
+# Data Planning lama mengubah kolom dengan pd.to_timedelta dulu, baru memformat per baris
+def legacy_hhmm_column(values):
+    return pd.to_timedelta(values).apply(legacy_hhmm)
+
+
+# Kolom TIME dari MySQL: timedelta64 dengan NaT
+def make_synthetic(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    seconds = rng.integers(0, 24 * 3600, n_rows).astype(float)
+    missing = rng.random(n_rows) < 0.1
+    return pd.Series(pd.to_timedelta(seconds, unit="s")).mask(missing)
+
+
+# Kolom object campuran: teks "N minutes/hours/days", Timedelta, None dan NaN
+def make_mixed(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    amounts = rng.integers(0, 60, n_rows)
+    units = rng.choice(["minutes", "hours", "day"], n_rows)
+    values = np.array([f"{amount} {unit}" for amount, unit in zip(amounts, units)], dtype=object)
+    kinds = rng.random(n_rows)
+    timedeltas = pd.to_timedelta(rng.integers(0, 24 * 3600, n_rows), unit="s")
+    values[kinds < 0.2] = list(timedeltas[kinds < 0.2])
+    values[(kinds >= 0.2) & (kinds < 0.25)] = None
+    values[(kinds >= 0.25) & (kinds < 0.3)] = np.nan
+    return pd.Series(values, dtype=object)
+
+
+# Kolom teks "HH:MM:SS" dengan None, seperti ETD/ETA yang terbaca sebagai teks
+def make_clock_text(n_rows, seed=0):
+    seconds = make_synthetic(n_rows, seed).dt.total_seconds()
+    text = seconds.map(lambda s: None if np.isnan(s) else f"{int(s // 3600):02}:{int(s % 3600 // 60):02}:00")
+    return text.astype(object)
+
+
+def timed(label, func):
+    started = time.perf_counter()
+    result = func()
+    print(f"{label:<36} {time.perf_counter() - started:>8.3f} detik")
+    return result
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    reference_time = datetime(2025, 1, 1)
+    print(f"{n_rows} baris sintetis")
+
+    inputs = {
+        "timedelta": make_synthetic(n_rows),
+        "campuran": make_mixed(n_rows),
+        "teks HH:MM:SS": make_clock_text(n_rows),
+    }
+    for kind, values in inputs.items():
+        if kind != "teks HH:MM:SS":
+            timed(f"timestamp lama, {kind}",
+                  lambda: values.apply(lambda x: legacy_convert_to_time(reference_time, x)))
+            timed(f"timestamp baru, {kind}", lambda: to_timestamps(reference_time, values))
+        if kind != "campuran":
+            timed(f"HH:MM lama, {kind}", lambda: legacy_hhmm_column(values))
+            timed(f"HH:MM baru, {kind}", lambda: to_hhmm(values))
@@ -0,0 +1,68 @@
+# Cek regresi tabel YoY Data Realisasi: pivot + growth per baris (.apply) vs yoy_table
+# Jalankan dari root repo: python benchmarks/bench_yoy_growth.py [jumlah_hari]
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yoy import year_ranges, yoy_table  # noqa: E402
+
+YEARS = [2023, 2024, 2025]
+
+
+# Total movement harian seperti hasil query: satu baris per tanggal_dummy, sebagian hari kosong
+def make_synthetic(month, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for year, start, end in year_ranges(YEARS, month=month):
+        days = pd.date_range(start, end)
+        days = days[rng.random(len(days)) > 0.1]
+        movement = rng.integers(0, 400, len(days))
+        movement[rng.random(len(days)) < 0.05] = 0
+        frames.append(pd.DataFrame({"tanggal_dummy": days.date, "total_movement": movement}))
+    return pd.concat(frames, ignore_index=True)
+
+
+# Implementasi lama dari pages/Data Realisasi.py (kolom per tahun seperti hasil query2 lama)
+def legacy_table(daily):
+    data2 = pd.DataFrame({"tanggal_dummy": pd.to_datetime(daily["tanggal_dummy"])})
+    for year in YEARS:
+        data2[f"total_movement_{year}"] = np.where(data2["tanggal_dummy"].dt.year == year, daily["total_movement"], 0)
+    data2["Tanggal"] = data2["tanggal_dummy"].dt.strftime("%d %B")
+    pivot_data = data2.groupby("Tanggal").agg({f"total_movement_{year}": "sum" for year in YEARS}).reset_index()
+    for previous_year, year in zip(YEARS, YEARS[1:]):
+        previous, current = f"total_movement_{previous_year}", f"total_movement_{year}"
+        pivot_data[f"Growth {previous_year}-{year}"] = pivot_data.apply(
+            lambda row: 0 if row[previous] == 0 else ((row[current] - row[previous]) / row[previous]) * 100,
+            axis=1,
+        ).round(1).astype(float).fillna(0)
+    return pivot_data
+
+
+if __name__ == "__main__":
+    for month in range(1, 13):
+        daily = make_synthetic(month, seed=month)
+        expected = legacy_table(daily)
+        actual = yoy_table(daily, year_ranges(YEARS, month=month))
+        if not np.allclose(expected.drop(columns="Tanggal").to_numpy(dtype=float),
+                           actual[expected.columns].drop(columns="Tanggal").to_numpy(dtype=float)) \
+                or list(expected["Tanggal"]) != list(actual["Tanggal"]):
+            print(f"GAGAL: hasil yoy_table berbeda untuk bulan {month}")
+            sys.exit(1)
+    print("Hasil identik dengan perhitungan growth lama (12 bulan)")
+
+    # Rentang hari panjang untuk mengukur waktu
+    n_days = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    ranges = year_ranges(YEARS, day_range=(date(2023, 1, 1), date(2023, 1, 1) + timedelta(days=n_days - 1)))
+    daily = pd.concat([
+        pd.DataFrame({"tanggal_dummy": pd.date_range(start, end).date, "total_movement": 100})
+        for _, start, end in ranges
+    ], ignore_index=True)
+    started = time.perf_counter()
+    yoy_table(daily, ranges)
+    print(f"yoy_table {len(daily)} baris: {time.perf_counter() - started:.3f} detik")
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import time
+
+import pymysql
+
+from ingest import column_mapping
+
+# Strategi bulk load yang tersedia
+STRATEGIES = {
+    "batch": "INSERT multi-baris per batch",
+    "load_data": "LOAD DATA LOCAL INFILE (CSV sementara)",
+}
+DEFAULT_STRATEGY = "batch"
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5  # detik, dikalikan dengan nomor percobaan
+
+
+def _batches(rows, batch_size):
+    for start in range(0, len(rows), batch_size):
+        yield rows[start:start + batch_size]
+
+
+# INSERT multi-baris: pymysql menulis ulang executemany atas `INSERT ... VALUES (...)`
+# menjadi satu statement `VALUES (...), (...), ...` per batch
+def _insert_batch(cursor, table_name, columns, batch):
+    placeholders = ", ".join(["%s" for _ in columns])
+    query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+    cursor.executemany(query, batch)
+
+
+# Format satu nilai untuk CSV LOAD DATA: NULL ditulis sebagai \N, teks di-escape dan diapit tanda kutip
+def _csv_value(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\r", "\\r")
+    return f'"{text}"'
+
+
+# LOAD DATA LOCAL INFILE dari file CSV sementara; koneksi harus dibuat dengan local_infile=True
+def _load_data_batch(cursor, table_name, columns, batch):
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8", newline="") as f:
+        for row in batch:
+            f.write(",".join(_csv_value(value) for value in row))
+            f.write("\n")
+        path = f.name
+    try:
+        cursor.execute(
+            f"""
+            LOAD DATA LOCAL INFILE %s INTO TABLE {table_name}
+            CHARACTER SET utf8mb4
+            FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"' ESCAPED BY '\\\\'
+            LINES TERMINATED BY '\\n'
+            ({', '.join(columns)})
+            """,
+            (path,),
+        )
+    finally:
+        os.remove(path)
+
+
+_writers = {
+    "batch": _insert_batch,
+    "load_data": _load_data_batch,
+}
+
+
+# Fungsi untuk menyimpan baris ke MySQL dalam batch
+# - commit_batches=True: setiap batch di-commit sendiri dan batch yang gagal di-rollback lalu dicoba ulang,
+#   sehingga backfill besar tidak menahan satu transaksi raksasa di tabel `flights`
+# - commit_batches=False: semua batch berada dalam transaksi pemanggil (tanpa retry per batch)
+# Mengembalikan statistik: rows, batches, retries, seconds, rows_per_sec
+def load_rows(conn, table_name, rows, columns=column_mapping, strategy=DEFAULT_STRATEGY,
+              batch_size=DEFAULT_BATCH_SIZE, max_retries=DEFAULT_MAX_RETRIES,
+              commit_batches=True, on_batch=None):
+    if strategy not in _writers:
+        raise ValueError(f"Strategi bulk load tidak dikenal: {strategy}")
+    writer = _writers[strategy]
+
+    stats = {"rows": 0, "batches": 0, "retries": 0}
+    started = time.perf_counter()
+    for batch in _batches(rows, batch_size):
+        attempt = 0
+        while True:
+            try:
+                with conn.cursor() as cursor:
+                    writer(cursor, table_name, columns, batch)
+                if commit_batches:
+                    conn.commit()
+                break
+            except pymysql.MySQLError as e:
+                if not commit_batches or attempt >= max_retries:
+                    raise ValueError(f"Kesalahan saat menyimpan ke database: {e}")
+                conn.rollback()
+                attempt += 1
+                stats["retries"] += 1
+                time.sleep(RETRY_BACKOFF * attempt)
+
+        stats["rows"] += len(batch)
+        stats["batches"] += 1
+        if on_batch:
+            on_batch(stats)
+
+    stats["seconds"] = time.perf_counter() - started
+    stats["rows_per_sec"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
@@ -0,0 +1,300 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import pymysql
+import streamlit as st
+
+from instrumentation import record_query
+from query_cache import get_query_cache, query_key
+
+# Nilai default pool, bisa ditimpa lewat st.secrets["mysql"]
+DEFAULT_POOL_SIZE = 5          # jumlah maksimum koneksi yang terbuka
+DEFAULT_POOL_TIMEOUT = 30      # detik menunggu koneksi kosong sebelum menyerah
+DEFAULT_POOL_RECYCLE = 3600    # koneksi lebih tua dari ini ditutup dan dibuat ulang
+DEFAULT_PING_INTERVAL = 30     # koneksi yang menganggur lebih lama dari ini di-ping dulu
+DEFAULT_QUERY_WAIT = 120       # detik menunggu query identik yang sedang berjalan di sesi lain
+
+
+class PoolTimeout(pymysql.MySQLError):
+    pass
+
+
+class QueryWaitTimeout(pymysql.MySQLError):
+    pass
+
+
+# Pool koneksi MySQL yang dibatasi dan aman dipakai banyak thread (satu thread per sesi Streamlit)
+class ConnectionPool:
+    def __init__(self, connect_kwargs, size=DEFAULT_POOL_SIZE, timeout=DEFAULT_POOL_TIMEOUT,
+                 recycle=DEFAULT_POOL_RECYCLE, ping_interval=DEFAULT_PING_INTERVAL):
+        self._connect_kwargs = connect_kwargs
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_interval = ping_interval
+
+        # Slot membatasi jumlah koneksi yang hidup; idle berisi (conn, dibuat, terakhir_dipakai)
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._stats = {
+            "checkouts": 0,
+            "created": 0,
+            "recycled": 0,
+            "failed_pings": 0,
+            "timeouts": 0,
+            "in_use": 0,
+            "wait_total": 0.0,
+            "wait_max": 0.0,
+        }
+
+    def _new_connection(self):
+        conn = pymysql.connect(**self._connect_kwargs)
+        with self._lock:
+            self._stats["created"] += 1
+        return conn, time.monotonic()
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    # Ambil koneksi sehat dari pool; koneksi basi di-recycle, koneksi lama yang menganggur di-ping
+    def acquire(self):
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise PoolTimeout(f"Tidak ada koneksi MySQL yang tersedia dalam {self.timeout} detik.")
+        waited = time.monotonic() - started
+
+        try:
+            conn, created_at = None, None
+            while conn is None:
+                try:
+                    conn, created_at, last_used = self._idle.get_nowait()
+                except queue.Empty:
+                    conn, created_at = self._new_connection()
+                    break
+
+                now = time.monotonic()
+                if now - created_at > self.recycle:
+                    self._close_quietly(conn)
+                    with self._lock:
+                        self._stats["recycled"] += 1
+                    conn = None
+                elif now - last_used > self.ping_interval:
+                    try:
+                        conn.ping(reconnect=False)
+                    except Exception:
+                        self._close_quietly(conn)
+                        with self._lock:
+                            self._stats["failed_pings"] += 1
+                        conn = None
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._stats["checkouts"] += 1
+            self._stats["in_use"] += 1
+            self._stats["wait_total"] += waited
+            self._stats["wait_max"] = max(self._stats["wait_max"], waited)
+        return conn, created_at
+
+    # Kembalikan koneksi ke pool; koneksi rusak ditutup agar slotnya bisa dipakai koneksi baru
+    # Transaksi dibatalkan dulu (autocommit mati, REPEATABLE READ): tanpa rollback snapshot baca dari SELECT
+    # pertama tetap terbuka selama koneksi menganggur, dan pemakai berikutnya tidak melihat upload terbaru.
+    # Jalur tulis (bulk_load, ledger, rollup) sudah commit sendiri sebelum koneksi dikembalikan.
+    def release(self, conn, created_at, broken=False):
+        try:
+            if not broken and conn.open:
+                try:
+                    conn.rollback()
+                except Exception:
+                    broken = True
+            if broken or not conn.open:
+                self._close_quietly(conn)
+            else:
+                self._idle.put((conn, created_at, time.monotonic()))
+        finally:
+            with self._lock:
+                self._stats["in_use"] -= 1
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        conn, created_at = self.acquire()
+        broken = False
+        try:
+            yield conn
+        except pymysql.err.OperationalError:
+            broken = True
+            raise
+        except Exception:
+            # Jangan kembalikan koneksi dengan transaksi setengah jalan ke pool
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+            raise
+        finally:
+            self.release(conn, created_at, broken=broken)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["size"] = self.size
+        stats["idle"] = self._idle.qsize()
+        stats["wait_avg"] = stats["wait_total"] / stats["checkouts"] if stats["checkouts"] else 0.0
+        return stats
+
+    def close(self):
+        while True:
+            try:
+                conn, _, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._close_quietly(conn)
+
+
+# Satu eksekusi untuk query identik yang berjalan bersamaan (mis. banyak sesi dibuka pada pergantian shift)
+# Pemanggil pertama menjalankan query; pemanggil lain dengan kunci sama menunggu dan memakai hasilnya.
+# Error diteruskan ke semua penunggu; setiap pemanggil menerima salinan DataFrame.
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, timeout=DEFAULT_QUERY_WAIT):
+        self.timeout = timeout
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._stats = {"executions": 0, "shared": 0, "wait_timeouts": 0, "errors": 0, "in_flight": 0}
+
+    def do(self, key, func):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._stats["executions"] += 1
+                self._stats["in_flight"] += 1
+            else:
+                self._stats["shared"] += 1
+
+        if leader:
+            try:
+                flight.result = func()
+            except BaseException as e:
+                flight.error = e
+                with self._lock:
+                    self._stats["errors"] += 1
+                raise
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                    self._stats["in_flight"] -= 1
+                flight.done.set()
+            return flight.result.copy()
+
+        if not flight.done.wait(self.timeout):
+            with self._lock:
+                self._stats["wait_timeouts"] += 1
+            raise QueryWaitTimeout(f"Query yang sama belum selesai dalam {self.timeout} detik.")
+        if flight.error is not None:
+            raise flight.error
+        return flight.result.copy()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+# Satu pool untuk semua sesi dan rerun Streamlit
+@st.cache_resource
+def get_pool():
+    secrets = st.secrets["mysql"]
+    connect_kwargs = dict(
+        host=secrets["host"],
+        user=secrets["username"],
+        password=secrets["password"],
+        database=secrets["database"],
+        port=secrets["port"],
+        # Diperlukan oleh strategi bulk load LOAD DATA LOCAL INFILE
+        local_infile=secrets.get("local_infile", False),
+    )
+    return ConnectionPool(
+        connect_kwargs,
+        size=secrets.get("pool_size", DEFAULT_POOL_SIZE),
+        timeout=secrets.get("pool_timeout", DEFAULT_POOL_TIMEOUT),
+        recycle=secrets.get("pool_recycle", DEFAULT_POOL_RECYCLE),
+        ping_interval=secrets.get("pool_ping_interval", DEFAULT_PING_INTERVAL),
+    )
+
+
+@st.cache_resource
+def get_single_flight():
+    return SingleFlight(timeout=st.secrets["mysql"].get("query_wait_timeout", DEFAULT_QUERY_WAIT))
+
+
+# Pinjam koneksi dari pool, otomatis dikembalikan saat blok `with` selesai
+@contextmanager
+def connection():
+    with get_pool().connection() as conn:
+        yield conn
+
+
+def _read_sql(query, params=None):
+    with connection() as conn:
+        return pd.read_sql(query, conn, params=params)
+
+
+# Query data; hasil dibagi antar sesi lewat cache query
+# `dates` (tanggal atau rentang (awal, akhir)) yang dibaca query membuat hasil hanya dibuang saat tanggal
+# tersebut diunggah ulang; tanpa `dates` hasil dibuang pada setiap upload. cache=False untuk selalu ke MySQL.
+# Saat cache kosong, query identik yang datang bersamaan hanya dijalankan sekali (SingleFlight).
+def run_query(query, params=None, dates=None, cache=True):
+    started = time.perf_counter()
+    frame, source = _run_query(query, params, dates, cache)
+    record_query(query, time.perf_counter() - started, frame, source)
+    return frame
+
+
+# Hasil query dan sumbernya: "cache" jika diambil dari cache query, selain itu "mysql"
+def _run_query(query, params, dates, cache):
+    if not cache:
+        return _read_sql(query, params), "mysql"
+
+    key = query_key(query, params)
+    query_cache = get_query_cache()
+    if query_cache is not None:
+        frame = query_cache.get(key)
+        if frame is not None:
+            return frame, "cache"
+
+    def execute():
+        # Versi dicatat sebelum query agar upload yang terjadi selama query membuat hasilnya basi
+        version = query_cache.current_version() if query_cache is not None else None
+        frame = _read_sql(query, params)
+        if query_cache is not None:
+            query_cache.put(key, frame, version, dates)
+        return frame
+
+    return get_single_flight().do(key, execute), "mysql"
+
+
+def pool_stats():
+    return get_pool().stats()
+
+
+def single_flight_stats():
+    return get_single_flight().stats()
@@ -0,0 +1,129 @@
+import csv
+import os
+import tempfile
+from decimal import Decimal
+
+import pymysql
+from pymysql.constants import FIELD_TYPE
+
+from db import connection
+from flights_browser import select_list, where_clause
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet opsional, CSV tetap tersedia
+    pa = None
+    pq = None
+
+# Ekspor rentang flights langsung dari cursor server-side (SSCursor) ke file sementara per chunk,
+# sehingga baris hasil query tidak pernah berada di memori sekaligus
+DEFAULT_EXPORT_CHUNK = 10_000
+EXPORT_FORMATS = ["csv", "parquet"] if pa is not None else ["csv"]
+
+_INTEGER_TYPES = {FIELD_TYPE.TINY, FIELD_TYPE.SHORT, FIELD_TYPE.LONG, FIELD_TYPE.LONGLONG, FIELD_TYPE.INT24,
+                  FIELD_TYPE.YEAR}
+_FLOAT_TYPES = {FIELD_TYPE.FLOAT, FIELD_TYPE.DOUBLE, FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL}
+_DATETIME_TYPES = {FIELD_TYPE.DATETIME, FIELD_TYPE.TIMESTAMP}
+
+
+# Tipe Arrow per kolom dari cursor.description agar skema sama untuk semua chunk
+def _arrow_schema(description):
+    fields = []
+    for column in description:
+        name, type_code = column[0], column[1]
+        if type_code in _INTEGER_TYPES:
+            arrow_type = pa.int64()
+        elif type_code in _FLOAT_TYPES:
+            arrow_type = pa.float64()
+        elif type_code == FIELD_TYPE.DATE:
+            arrow_type = pa.date32()
+        elif type_code in _DATETIME_TYPES:
+            arrow_type = pa.timestamp("us")
+        elif type_code == FIELD_TYPE.TIME:
+            arrow_type = pa.duration("us")
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def _arrow_value(value, arrow_type):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, bytes) and pa.types.is_string(arrow_type):
+        return value.decode("utf-8", errors="replace")
+    if value is not None and pa.types.is_string(arrow_type) and not isinstance(value, str):
+        return str(value)
+    return value
+
+
+class _CsvWriter:
+    def __init__(self, path, columns):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    def __init__(self, path, description):
+        self._schema = _arrow_schema(description)
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows):
+        columns = list(zip(*rows))
+        arrays = [
+            pa.array([_arrow_value(value, field.type) for value in values], type=field.type)
+            for field, values in zip(self._schema, columns)
+        ]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+# Tulis baris flights yang cocok dengan rentang/filter per chunk ke direktori sementara, lalu kembalikan
+# (isi file dalam bytes, jumlah baris); direktori sementara selalu dihapus setelahnya
+# `on_progress(rows)` dipanggil setelah setiap chunk
+def export_flights(start_date, end_date, columns, filters=None, fmt="csv", descending=False,
+                   chunk_size=DEFAULT_EXPORT_CHUNK, on_progress=None):
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format ekspor '{fmt}' tidak tersedia (Parquet membutuhkan pyarrow).")
+    column_list = select_list(columns)
+    where, params = where_clause(start_date, end_date, filters)
+    direction = "DESC" if descending else "ASC"
+    query = f"SELECT {column_list} FROM flights WHERE {where} ORDER BY tanggal_dummy {direction}, id {direction}"
+
+    total = 0
+    with tempfile.TemporaryDirectory(prefix="flights_") as directory:
+        path = os.path.join(directory, f"flights.{fmt}")
+        with connection() as conn:
+            cursor = conn.cursor(pymysql.cursors.SSCursor)
+            try:
+                cursor.execute(query, tuple(params))
+                if fmt == "csv":
+                    writer = _CsvWriter(path, [column[0] for column in cursor.description])
+                else:
+                    writer = ParquetWriter(path, cursor.description)
+                try:
+                    while True:
+                        rows = cursor.fetchmany(chunk_size)
+                        if not rows:
+                            break
+                        writer.write(rows)
+                        total += len(rows)
+                        if on_progress is not None:
+                            on_progress(total)
+                finally:
+                    writer.close()
+            finally:
+                cursor.close()
+        with open(path, "rb") as export_file:
+            data = export_file.read()
+    return data, total
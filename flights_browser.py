@@ -0,0 +1,88 @@
+from db import run_query
+from rollup import read_flight_count, rollup_enabled
+
+# Penjelajahan tabel flights per halaman dengan keyset pagination pada (tanggal_dummy, id)
+# Memori per sesi dibatasi ukuran halaman, bukan panjang rentang tanggal
+KEY_COLUMNS = ["tanggal_dummy", "id"]
+PAGE_SIZES = [50, 100, 500, 1000]
+# Kolom filter yang didukung index (tanggal_dummy, ADEP) dan (tanggal_dummy, ADES)
+FILTER_COLUMNS = ["ADEP", "ADES"]
+
+
+# Daftar kolom tabel flights (dipakai juga sebagai whitelist nama kolom di SQL)
+def flight_columns():
+    return run_query("SHOW COLUMNS FROM flights")["Field"].tolist()
+
+
+# Klausa WHERE untuk rentang tanggal dan filter kolom berindex; nilai filter kosong diabaikan
+def where_clause(start_date, end_date, filters):
+    clauses = ["tanggal_dummy BETWEEN %s AND %s"]
+    params = [start_date, end_date]
+    for column in FILTER_COLUMNS:
+        value = (filters or {}).get(column)
+        if value:
+            clauses.append(f"{column} = %s")
+            params.append(value)
+    return " AND ".join(clauses), params
+
+
+# Daftar kolom SELECT yang sudah divalidasi; kolom kunci selalu ikut di depan
+def select_list(columns):
+    allowed = set(flight_columns())
+    unknown = [column for column in columns if column not in allowed]
+    if unknown:
+        raise ValueError(f"Kolom tidak dikenal: {', '.join(unknown)}")
+    selected = KEY_COLUMNS + [column for column in columns if column not in KEY_COLUMNS]
+    return ", ".join(f"`{column}`" for column in selected)
+
+
+# Jumlah baris yang cocok dengan filter: dari rollup harian jika aktif, selain itu COUNT lewat index
+# rentang tanggal (rollup tidak menyimpan kombinasi ADEP + ADES)
+def count_flights(start_date, end_date, filters=None):
+    adep, ades = (filters or {}).get("ADEP"), (filters or {}).get("ADES")
+    if rollup_enabled() and not (adep and ades):
+        return read_flight_count(start_date, end_date, adep=adep, ades=ades)
+    query, params = count_query(start_date, end_date, filters)
+    df = run_query(query, params, dates=[(start_date, end_date)])
+    return int(df["total"].iloc[0])
+
+
+# Query COUNT untuk filter: (sql, params)
+def count_query(start_date, end_date, filters=None):
+    where, params = where_clause(start_date, end_date, filters)
+    return f"SELECT COUNT(*) AS total FROM flights WHERE {where}", tuple(params)
+
+
+# Query satu halaman untuk daftar kolom dari select_list: (sql, params)
+def page_query(column_list, start_date, end_date, filters=None, descending=False, after=None, page_size=100):
+    where, params = where_clause(start_date, end_date, filters)
+    if after is not None:
+        op = "<" if descending else ">"
+        where += f" AND (tanggal_dummy {op} %s OR (tanggal_dummy = %s AND id {op} %s))"
+        params += [after[0], after[0], after[1]]
+    direction = "DESC" if descending else "ASC"
+    query = f"""
+        SELECT {column_list}
+        FROM flights
+        WHERE {where}
+        ORDER BY tanggal_dummy {direction}, id {direction}
+        LIMIT %s
+    """
+    return query, tuple(params + [int(page_size)])
+
+
+# Ambil satu halaman setelah kunci `after` = (tanggal_dummy, id) dari baris terakhir halaman sebelumnya
+def fetch_page(start_date, end_date, columns, filters=None, descending=False, after=None, page_size=100):
+    query, params = page_query(
+        select_list(columns), start_date, end_date, filters=filters, descending=descending, after=after,
+        page_size=page_size,
+    )
+    return run_query(query, params, dates=[(start_date, end_date)])
+
+
+# Kunci lanjutan dari baris terakhir halaman, None jika halaman kosong
+def page_cursor(page):
+    if page.empty:
+        return None
+    last = page.iloc[-1]
+    return last["tanggal_dummy"], int(last["id"])
@@ -0,0 +1,307 @@
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import time as dtime
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+# Template nama file dan mapping kolom
+required_files = ["WARE", "WARR", "WARW", "WARC", "WARD", "WADY", "WARA", "WART"]
+file_template = r"\(Data Movement Cabang (\w+)\) .+\.(xls|xlsx)"
+column_mapping = [
+    "TANGGAL", "ACID", "A_REG", "A_TYPE", "ADEP", "ADES", "EOBT", "PUSHBACK", "TAXI",
+    "DEP_ARR_LOCAL", "ATD", "ETA", "ATA", "RIU", "POB", "REMARK", "STATUS_FLIGHT"
+]
+
+# Jumlah baris per chunk untuk mode streaming
+DEFAULT_CHUNK_SIZE = 5000
+
+
+# Fungsi untuk membaca file Excel
+def read_excel_file(uploaded_file):
+    try:
+        data = pd.read_excel(uploaded_file, skiprows=6, engine="openpyxl", header=None)
+        data = data.iloc[:, 1:]  # Hapus kolom pertama
+        if len(data.columns) != len(column_mapping):
+            raise ValueError(
+                f"Jumlah kolom di file Excel ({len(data.columns)}) tidak sesuai dengan yang diharapkan ({len(column_mapping)})."
+            )
+        data.columns = column_mapping
+        return data
+    except Exception as e:
+        raise ValueError(f"Kesalahan saat membaca file Excel: {e}")
+
+# Tipe target per kolom saat dibersihkan
+date_columns = ["TANGGAL"]
+time_columns = ["EOBT", "PUSHBACK", "TAXI", "ATD", "ETA", "ATA"]
+int_columns = ["POB"]
+text_columns = ["ACID", "A_REG", "A_TYPE", "ADEP", "ADES", "DEP_ARR_LOCAL", "RIU", "REMARK", "STATUS_FLIGHT"]
+
+
+# Ubah array menjadi object dengan None di posisi kosong (siap untuk driver MySQL)
+def _with_none(values, missing):
+    values = np.asarray(values).astype(object)
+    values[np.asarray(missing)] = None
+    return values
+
+def _to_date(col):
+    parsed = pd.to_datetime(col, errors="coerce")
+    return _with_none(parsed.dt.date, parsed.isna())
+
+def _to_time(col):
+    # Nilai dari Excel bisa berupa datetime.time, datetime, atau teks "HH:MM[:SS]"
+    # datetime.time (kasus umum dari openpyxl) dipakai apa adanya; hanya sisanya yang diparse dari teks
+    values = col.to_numpy(dtype=object)
+    is_time = np.fromiter((isinstance(value, dtime) for value in values), dtype=bool, count=len(values))
+    result = values.copy()
+    result[~is_time] = None
+    rest = ~is_time & col.notna().to_numpy()
+    if rest.any():
+        text = col[rest].astype(str).str.strip()
+        parsed = pd.to_datetime(text, format="%H:%M:%S", errors="coerce")
+        for fmt in ("%H:%M", None):
+            missing = parsed.isna()
+            if not missing.any():
+                break
+            parsed[missing] = pd.to_datetime(text[missing], format=fmt, errors="coerce")
+        result[rest] = _with_none(parsed.dt.time, parsed.isna())
+    return result
+
+# int64 agar nilai besar tidak berputar (int16 mengubah 40000 menjadi -25536); nilai di luar rentang
+# kolom MySQL ditolak oleh server, bukan disimpan diam-diam sebagai angka lain
+def _to_int(col):
+    parsed = pd.to_numeric(col, errors="coerce")
+    missing = parsed.isna()
+    return _with_none(parsed.fillna(0).round().astype(np.int64), missing)
+
+def _to_text(col):
+    return _with_none(col.astype(str).str.strip(), col.isna())
+
+# Kolom kode yang terbaca sebagai float (mis. 123.0) dikembalikan ke bentuk bulat
+# Diputuskan untuk seluruh kolom sebelum dipotong per chunk agar hasilnya tidak bergantung pada batas chunk
+def _integral_codes(col):
+    if pd.api.types.is_float_dtype(col) and (col.dropna() % 1 == 0).all():
+        return col.astype("Int64")
+    return col
+
+def _to_native(col):
+    return _with_none(col, col.isna())
+
+column_converters = {}
+column_converters.update({col: _to_date for col in date_columns})
+column_converters.update({col: _to_time for col in time_columns})
+column_converters.update({col: _to_int for col in int_columns})
+column_converters.update({col: _to_text for col in text_columns})
+
+
+# Jumlah baris yang dikonversi sekaligus oleh clean_data
+CLEAN_CHUNK_ROWS = 20_000
+
+
+# Fungsi untuk membersihkan dan menyesuaikan data
+# Setiap kolom dikonversi secara vektor ke tipe targetnya, lalu baris langsung dirangkai
+# menjadi tuple untuk driver MySQL tanpa membuat DataFrame object perantara.
+# Konversi berjalan per CLEAN_CHUNK_ROWS baris sehingga kolom hasil konversi hanya hidup sepanjang satu chunk,
+# tidak sepanjang file di samping daftar tuple. Urutan nilai dalam tuple mengikuti `data.columns`.
+def clean_data(data):
+    columns = [
+        (_integral_codes(data[col]) if col in text_columns else data[col], column_converters.get(col, _to_native))
+        for col in data.columns
+    ]
+    rows = []
+    for start in range(0, len(data), CLEAN_CHUNK_ROWS):
+        stop = start + CLEAN_CHUNK_ROWS
+        rows.extend(zip(*[convert(values.iloc[start:stop]).tolist() for values, convert in columns]))
+    return rows
+
+# Fungsi untuk membaca file Excel secara streaming (read-only openpyxl)
+# Menghasilkan DataFrame per `chunk_size` baris yang sudah memakai `column_mapping`,
+# sehingga memori tetap konstan berapapun ukuran file
+def iter_excel_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    try:
+        workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    except Exception as e:
+        raise ValueError(f"Kesalahan saat membaca file Excel: {e}")
+
+    n_columns = len(column_mapping)
+    try:
+        sheet = workbook.worksheets[0]
+        buffer = []
+        # Lebar terisi (tanpa sel kosong di ujung) dan lebar baris apa adanya, divalidasi pada chunk pertama:
+        # kolom terakhir yang seluruhnya kosong tetap sah selama lembarnya memang memiliki kolom tersebut
+        width = declared = 0
+        validated = False
+        # Baris 1-6 adalah header laporan, sama seperti skiprows=6 pada read_excel
+        for row in sheet.iter_rows(min_row=7, values_only=True):
+            values = list(row[1:])  # Hapus kolom pertama
+            declared = max(declared, len(values))
+            while values and values[-1] is None:
+                values.pop()
+            if not values:
+                continue  # Lewati baris kosong
+            width = max(width, len(values))
+            if width > n_columns:
+                _check_column_count(width)
+            buffer.append(values + [None] * (n_columns - len(values)))
+
+            if len(buffer) >= chunk_size:
+                if not validated:
+                    _check_column_count(width, declared)
+                    validated = True
+                yield pd.DataFrame(buffer, columns=column_mapping)
+                buffer = []
+
+        if buffer:
+            if not validated:
+                _check_column_count(width, declared)
+            yield pd.DataFrame(buffer, columns=column_mapping)
+    finally:
+        workbook.close()
+
+# `width` = kolom terisi, `declared` = kolom yang dimiliki lembar (termasuk kolom kosong di ujung)
+def _check_column_count(width, declared=None):
+    n_columns = len(column_mapping)
+    if width > n_columns:
+        count = width
+    elif max(width, declared or 0) < n_columns:
+        count = max(width, declared or 0)
+    else:
+        return
+    raise ValueError(f"Jumlah kolom di file Excel ({count}) tidak sesuai dengan yang diharapkan ({n_columns}).")
+
+# Dijalankan di proses worker: baca dan bersihkan satu file cabang
+def parse_branch_file(file_key, content):
+    timings = {}
+    started = time.perf_counter()
+    data = read_excel_file(io.BytesIO(content))
+    timings["parse"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    data = clean_data(data)
+    timings["clean"] = time.perf_counter() - started
+    return file_key, data, timings
+
+
+def default_workers(n_files):
+    return max(1, min(n_files, os.cpu_count() or 1))
+
+
+# Dijalankan di thread pemanggil pada mode streaming: baca, bersihkan, dan serahkan chunk satu per satu
+def stream_branch_chunks(content, timings, on_rows=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    reader = iter_excel_chunks(io.BytesIO(content), chunk_size)
+    rows = 0
+    while True:
+        started = time.perf_counter()
+        chunk = next(reader, None)
+        timings["parse"] += time.perf_counter() - started
+        if chunk is None:
+            break
+
+        started = time.perf_counter()
+        chunk = clean_data(chunk)
+        timings["clean"] += time.perf_counter() - started
+
+        rows += len(chunk)
+        timings["rows"] = rows
+        if on_rows:
+            on_rows(rows)
+        yield chunk
+
+
+# Pipeline ingest multi-cabang dengan dua mode:
+# - "parallel": parsing Excel (CPU-bound) berjalan paralel di process pool dan penulisan ke database
+#   dilakukan di thread pemanggil segera setelah satu cabang selesai diparsing, sehingga penulisan
+#   cabang pertama tumpang tindih dengan parsing cabang lainnya
+# - "stream": file dibaca per chunk dan tiap chunk langsung dibersihkan lalu disimpan,
+#   memori puncak dibatasi oleh `chunk_size`, bukan ukuran file
+# `files` berisi (file_key, content_bytes); `write(file_key, chunks)` menyimpan iterable chunk
+# (list tuple hasil `clean_data`) satu cabang; `on_event(file_key, stage, info)` dipanggil di thread
+# pemanggil untuk memperbarui UI.
+# Jika process pool rusak (worker mati, mis. kehabisan memori), file yang belum selesai diparsing dibaca ulang
+# dengan mode "stream" di proses ini dan hasilnya ditandai `pool_broken` agar pemanggil membuat pool baru.
+def run_pipeline(files, write, on_event=None, executor=None, max_workers=None,
+                 mode="parallel", chunk_size=DEFAULT_CHUNK_SIZE):
+    on_event = on_event or (lambda *args: None)
+    if mode == "stream":
+        return _run_streaming(files, write, on_event, chunk_size)
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=max_workers or default_workers(len(files)))
+
+    contents = dict(files)
+    results = {}
+    broken = []
+    try:
+        futures = {}
+        for file_key, content in contents.items():
+            try:
+                futures[executor.submit(parse_branch_file, file_key, content)] = file_key
+            except BrokenProcessPool:
+                broken.append(file_key)
+                continue
+            on_event(file_key, "parsing", {})
+
+        for future in as_completed(futures):
+            file_key = futures[future]
+            try:
+                _, data, timings = future.result()
+            except BrokenProcessPool:
+                broken.append(file_key)
+                continue
+            except Exception as e:
+                results[file_key] = {"status": "error", "error": str(e)}
+                on_event(file_key, "error", results[file_key])
+                continue
+
+            on_event(file_key, "writing", dict(timings, rows=len(data)))
+            started = time.perf_counter()
+            try:
+                write(file_key, [data])
+            except Exception as e:
+                results[file_key] = dict(timings, rows=len(data), status="error", error=str(e))
+                on_event(file_key, "error", results[file_key])
+                continue
+            timings["write"] = time.perf_counter() - started
+
+            results[file_key] = dict(timings, rows=len(data), status="done")
+            on_event(file_key, "done", results[file_key])
+    finally:
+        if own_executor:
+            executor.shutdown(wait=True)
+
+    if broken:
+        fallback = _run_streaming([(key, contents[key]) for key in broken], write, on_event, chunk_size)
+        for result in fallback.values():
+            result["pool_broken"] = True
+        results.update(fallback)
+    return results
+
+
+def _run_streaming(files, write, on_event, chunk_size):
+    results = {}
+    for file_key, content in files:
+        timings = {"parse": 0.0, "clean": 0.0, "rows": 0}
+        on_event(file_key, "writing", {})
+        chunks = stream_branch_chunks(
+            content, timings,
+            on_rows=lambda rows, key=file_key: on_event(key, "writing", {"rows": rows}),
+            chunk_size=chunk_size,
+        )
+        started = time.perf_counter()
+        try:
+            write(file_key, chunks)
+        except Exception as e:
+            results[file_key] = dict(timings, status="error", error=str(e))
+            on_event(file_key, "error", results[file_key])
+            continue
+        # Waktu tulis bersih = total dikurangi waktu baca dan pembersihan yang terjadi di dalam iterasi
+        timings["write"] = time.perf_counter() - started - timings["parse"] - timings["clean"]
+
+        results[file_key] = dict(timings, status="done")
+        on_event(file_key, "done", results[file_key])
+    return results
@@ -0,0 +1,174 @@
+import contextvars
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from query_cache import normalize_sql
+
+# Pencatatan waktu per query, per langkah olah data (pandas) dan per render grafik, dengan konteks
+# halaman/bagian yang memicunya. Setiap kejadian ditulis sebagai satu baris JSON ke logger
+# "dashboard.instrumentation" dan disimpan di buffer bersama untuk panel debug di sidebar.
+DEFAULT_MAX_EVENTS = 5000
+LOGGER_NAME = "dashboard.instrumentation"
+
+# (halaman, bagian, waktu mulai run halaman) untuk thread script yang sedang berjalan
+_page_context = contextvars.ContextVar("page_context", default=(None, None, None))
+# Nama query bernama yang sedang dijalankan (diisi oleh queries.run_named)
+_query_label = contextvars.ContextVar("query_label", default=None)
+
+
+def _instrumentation_settings():
+    return st.secrets.get("instrumentation", {})
+
+
+def instrumentation_enabled():
+    return _instrumentation_settings().get("enabled", True)
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record):
+        return json.dumps(getattr(record, "event", {"message": record.getMessage()}), default=str)
+
+
+# Buffer kejadian bersama semua sesi; handler log JSON dipasang sekali per proses
+@st.cache_resource
+def _event_store():
+    settings = _instrumentation_settings()
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    log_file = settings.get("log_file")
+    handler = logging.FileHandler(log_file, encoding="utf-8") if log_file else logging.StreamHandler()
+    handler.setFormatter(_JsonFormatter())
+    logger.addHandler(handler)
+    return {
+        "lock": threading.Lock(),
+        "events": deque(maxlen=int(settings.get("max_events", DEFAULT_MAX_EVENTS))),
+        "logger": logger,
+    }
+
+
+# Tandai awal run halaman; dipanggil di baris awal setiap script halaman
+def set_page(page):
+    _page_context.set((page, None, time.perf_counter()))
+
+
+# Bagian halaman yang sedang dirender, berlaku sampai set_section berikutnya
+def set_section(section):
+    page, _, started = _page_context.get()
+    _page_context.set((page, section, started))
+
+
+@contextmanager
+def query_label(name):
+    token = _query_label.set(name)
+    try:
+        yield
+    finally:
+        _query_label.reset(token)
+
+
+# Catat satu kejadian: kind = query | compute | render | page
+def record(kind, name, seconds, **fields):
+    if not instrumentation_enabled():
+        return
+    page, section, _ = _page_context.get()
+    event = {
+        "ts": time.time(),
+        "kind": kind,
+        "page": page,
+        "section": section,
+        "name": name,
+        "ms": round(seconds * 1000, 3),
+        **fields,
+    }
+    store = _event_store()
+    with store["lock"]:
+        store["events"].append(event)
+    store["logger"].info(kind, extra={"event": event})
+
+
+# Catat query: waktu, jumlah baris, perkiraan ukuran hasil (tanpa menghitung isi string) dan sumbernya
+# (mysql, cache, duckdb, snapshot); nama query bernama dipakai jika ada, selain itu awal teks SQL
+def record_query(query, seconds, frame, source):
+    name = _query_label.get() or normalize_sql(query)[:120]
+    record(
+        "query", name, seconds,
+        source=source,
+        rows=len(frame),
+        bytes=int(frame.memory_usage(index=True, deep=False).sum()),
+    )
+
+
+# Ukur satu blok olah data atau render: with timed("compute", "klasifikasi movement"): ...
+@contextmanager
+def timed(kind, name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(kind, name, time.perf_counter() - started)
+
+
+# Panggil fungsi render (st.plotly_chart, st.pyplot, folium_static) sambil mengukur waktunya
+def render(func, *args, name=None, **kwargs):
+    with timed("render", name or func.__name__):
+        return func(*args, **kwargs)
+
+
+def recent_events(page=None):
+    store = _event_store()
+    with store["lock"]:
+        events = list(store["events"])
+    return [event for event in events if page is None or event["page"] == page]
+
+
+# Ringkasan p50/p95 per (jenis, bagian, nama) dari kejadian terakhir, diurutkan dari total waktu terbesar
+def summary(page=None):
+    events = pd.DataFrame(recent_events(page))
+    if events.empty:
+        return events
+    events["section"] = events["section"].fillna("-")
+    grouped = events.groupby(["kind", "section", "name"], sort=False)
+    table = pd.DataFrame({
+        "n": grouped["ms"].size(),
+        "p50 ms": grouped["ms"].agg(lambda ms: np.percentile(ms, 50)).round(1),
+        "p95 ms": grouped["ms"].agg(lambda ms: np.percentile(ms, 95)).round(1),
+        "total ms": grouped["ms"].sum().round(1),
+    })
+    if "rows" in events:
+        table["rows"] = grouped["rows"].sum(min_count=1)
+        table["bytes"] = grouped["bytes"].sum(min_count=1)
+    return table.sort_values("total ms", ascending=False).reset_index()
+
+
+def clear_events():
+    store = _event_store()
+    with store["lock"]:
+        store["events"].clear()
+
+
+# Panel debug opsional ([instrumentation] panel = true); dipanggil di akhir script halaman agar
+# waktu total run halaman ini ikut tercatat
+def debug_panel():
+    page, _, started = _page_context.get()
+    if started is not None:
+        set_section(None)
+        record("page", "run halaman", time.perf_counter() - started)
+    if not instrumentation_enabled() or not _instrumentation_settings().get("panel", False):
+        return
+    with st.sidebar.expander("Debug: waktu query & render"):
+        if st.button("Reset catatan"):
+            clear_events()
+        table = summary(page)
+        if table.empty:
+            st.write("Belum ada catatan.")
+        else:
+            st.dataframe(table)
@@ -0,0 +1,179 @@
+import hashlib
+from datetime import timedelta
+
+from bulk_load import load_rows
+from ingest import column_mapping
+
+# Ledger ingest: satu baris per (hash isi file, cabang) agar file yang sama tidak dimuat dua kali
+LEDGER_TABLE = "ingestion_ledger"
+TANGGAL_INDEX = column_mapping.index("TANGGAL")
+
+STATUS_LOADING = "loading"
+STATUS_DONE = "done"
+
+# Kolom asal baris di tabel flights: cabang yang filenya memuat baris tersebut
+# Penerbangan antar cabang (mis. WARR-WART) ada di file kedua cabang, sehingga mode ganti hanya boleh
+# menghapus baris yang dimuat dari file cabang itu sendiri
+SOURCE_COLUMN = "SOURCE_CABANG"
+
+
+def ensure_ledger_table(conn):
+    with conn.cursor() as cursor:
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {LEDGER_TABLE} (
+                file_hash CHAR(64) NOT NULL,
+                cabang VARCHAR(10) NOT NULL,
+                file_name VARCHAR(255),
+                status ENUM('{STATUS_LOADING}', '{STATUS_DONE}') NOT NULL,
+                row_count INT,
+                tanggal_min DATE,
+                tanggal_max DATE,
+                loaded_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (file_hash, cabang),
+                KEY idx_cabang_tanggal (cabang, tanggal_min, tanggal_max)
+            )
+        """)
+    conn.commit()
+
+
+# Kolom asal dibuat oleh migrasi 4 (python migrations.py migrate), bukan saat halaman dibuka:
+# ALTER TABLE pada flights yang besar terlalu lama untuk dijalankan di request
+def has_source_column(conn, table_name):
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT COUNT(*) FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+            """,
+            (table_name, SOURCE_COLUMN),
+        )
+        return cursor.fetchone()[0] > 0
+
+
+def file_hash(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+# Status file di ledger (None jika belum pernah dimuat); lookup lewat primary key
+def ledger_status(conn, content_hash, cabang):
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"SELECT status FROM {LEDGER_TABLE} WHERE file_hash = %s AND cabang = %s",
+            (content_hash, cabang),
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+# Tandai file sedang dimuat; tidak melakukan commit
+def start_entry(conn, content_hash, cabang, file_name):
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {LEDGER_TABLE} (file_hash, cabang, file_name, status)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE file_name = VALUES(file_name), status = VALUES(status),
+                row_count = NULL, tanggal_min = NULL, tanggal_max = NULL, loaded_at = CURRENT_TIMESTAMP
+            """,
+            (content_hash, cabang, file_name, STATUS_LOADING),
+        )
+
+
+# Tandai file selesai dimuat beserta ringkasan isinya; tidak melakukan commit
+def finish_entry(conn, content_hash, cabang, row_count, tanggal_min, tanggal_max):
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {LEDGER_TABLE}
+            SET status = %s, row_count = %s, tanggal_min = %s, tanggal_max = %s, loaded_at = CURRENT_TIMESTAMP
+            WHERE file_hash = %s AND cabang = %s
+            """,
+            (STATUS_DONE, row_count, tanggal_min, tanggal_max, content_hash, cabang),
+        )
+
+
+# Hapus baris flights yang dimuat dari file cabang pada tanggal tertentu (mode ganti); tidak melakukan commit
+# Baris cabang lain dengan ADEP/ADES yang sama tetap ada
+def delete_branch_days(conn, table_name, cabang, dates):
+    if not dates:
+        return 0
+    placeholders = ", ".join(["%s" for _ in dates])
+    with conn.cursor() as cursor:
+        return cursor.execute(
+            f"DELETE FROM {table_name} WHERE {SOURCE_COLUMN} = %s AND TANGGAL IN ({placeholders})",
+            (cabang, *sorted(dates)),
+        )
+
+
+# Entri ledger lain untuk cabang yang sama yang semua harinya sudah diganti tidak berlaku lagi; tidak melakukan
+# commit. Entri yang hanya sebagian harinya diganti tetap disimpan: hari lainnya masih berasal dari file itu,
+# dan tanpa entri upload ulang file tersebut (mode biasa) akan memuat hari-hari itu dua kali.
+def drop_replaced_entries(conn, content_hash, cabang, dates):
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT file_hash, tanggal_min, tanggal_max FROM {LEDGER_TABLE}
+            WHERE cabang = %s AND file_hash <> %s AND tanggal_min <= %s AND tanggal_max >= %s
+            """,
+            (cabang, content_hash, max(dates), min(dates)),
+        )
+        replaced = [
+            entry_hash for entry_hash, tanggal_min, tanggal_max in cursor.fetchall()
+            if all(
+                tanggal_min + timedelta(days=offset) in dates
+                for offset in range((tanggal_max - tanggal_min).days + 1)
+            )
+        ]
+        if replaced:
+            placeholders = ", ".join(["%s" for _ in replaced])
+            cursor.execute(
+                f"DELETE FROM {LEDGER_TABLE} WHERE cabang = %s AND file_hash IN ({placeholders})",
+                (cabang, *replaced),
+            )
+    return replaced
+
+
+# Baris hasil clean_data ditambah kolom asal cabang
+def with_source(rows, cabang):
+    return [(*row, cabang) for row in rows]
+
+
+# Tanggal unik dalam satu chunk baris hasil clean_data
+def chunk_dates(rows):
+    return {row[TANGGAL_INDEX] for row in rows if row[TANGGAL_INDEX] is not None}
+
+
+# Muat satu file cabang dengan pencatatan ledger
+# - mode biasa: batch di-commit satu per satu; entri ledger berstatus 'loading' sampai selesai sehingga
+#   file yang gagal di tengah jalan akan dimuat ulang dengan mode ganti pada upload berikutnya
+# - mode ganti: hapus baris cabang pada tanggal yang ada di file lalu muat ulang, semuanya dalam satu transaksi
+def load_branch(conn, table_name, cabang, content_hash, file_name, chunks, replace=False, **load_kwargs):
+    start_entry(conn, content_hash, cabang, file_name)
+    if not replace:
+        conn.commit()
+
+    dates = set()
+    result = {"rows": 0, "retries": 0}
+    for chunk in chunks:
+        new_dates = chunk_dates(chunk)
+        if replace:
+            # Tanggal yang sudah dihapus tidak dihapus lagi agar baris yang baru dimuat tetap ada
+            delete_branch_days(conn, table_name, cabang, new_dates - dates)
+        dates |= new_dates
+
+        stats = load_rows(
+            conn, table_name, with_source(chunk, cabang), columns=column_mapping + [SOURCE_COLUMN],
+            commit_batches=not replace, **load_kwargs,
+        )
+        result["rows"] += stats["rows"]
+        result["retries"] += stats["retries"]
+
+    tanggal_min = min(dates) if dates else None
+    tanggal_max = max(dates) if dates else None
+    if replace and dates:
+        drop_replaced_entries(conn, content_hash, cabang, dates)
+    finish_entry(conn, content_hash, cabang, result["rows"], tanggal_min, tanggal_max)
+    conn.commit()
+
+    result["dates"] = dates
+    return result
@@ -0,0 +1,225 @@
+import sys
+from datetime import date, timedelta
+
+from db import connection
+from flights_browser import count_query, page_query, select_list
+from ledger import SOURCE_COLUMN
+from planning import DAY_COLUMNS
+from queries import named_query
+from snapshot import airport_where, mysql_query
+from traffic import FLIGHT_COLUMNS
+from yoy import daily_movements_params, daily_movements_sql, year_ranges
+
+# Migrasi skema bernomor; versi yang sudah dijalankan dicatat di tabel schema_migrations
+# Setiap langkah adalah (tabel, nama index, kolom) dan aman dijalankan ulang: index yang sudah ada dilewati
+# Migrasi boleh memiliki elemen keempat (tabel, kolom, definisi) untuk kolom yang ditambahkan sebelum index
+MIGRATIONS_TABLE = "schema_migrations"
+
+# Data Realisasi membaca sub_flight_db, halaman lain dan upload memakai database di secrets
+FLIGHTS_TABLES = ["flights", "sub_flight_db.flights"]
+
+MIGRATIONS = [
+    (1, "index tanggal dan bandara pada flights", [
+        (table, name, columns)
+        for table in FLIGHTS_TABLES
+        for name, columns in [
+            ("idx_tanggal_dummy_adep", ["tanggal_dummy", "ADEP"]),
+            ("idx_tanggal_dummy_ades", ["tanggal_dummy", "ADES"]),
+            ("idx_tanggal", ["TANGGAL"]),
+        ]
+    ]),
+    (2, "index tanggal dan penerbangan pada pprp", [
+        ("sub_flight_db_2.pprp", "idx_tanggal_airline_flight", ["TANGGAL", "ICAO_AIRLINE", "FLIGHT_NUMBER"]),
+        ("sub_flight_db_2.pprp", "idx_airline_flight_rute", ["ICAO_AIRLINE", "FLIGHT_NUMBER", "RUTE"]),
+    ]),
+    (3, "index ICAO_CODE pada airports dan airlines", [
+        ("sub_flight_db.airports", "idx_icao_code", ["ICAO_CODE"]),
+        ("sub_flight_db.airlines", "idx_icao_code", ["ICAO_CODE"]),
+        ("sub_flight_db_2.airlines", "idx_icao_code", ["ICAO_CODE"]),
+    ]),
+    # Upload menulis ke flights di database secrets; baris lama bernilai NULL dan tidak disentuh mode ganti
+    (4, "kolom asal cabang pada flights", [
+        ("flights", "idx_source_tanggal", [SOURCE_COLUMN, "TANGGAL"]),
+    ], [
+        ("flights", SOURCE_COLUMN, "VARCHAR(10) NULL"),
+    ]),
+]
+
+
+def ensure_migrations_table(conn):
+    with conn.cursor() as cursor:
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+                version INT NOT NULL PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+    conn.commit()
+
+
+def applied_versions(conn):
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT version FROM {MIGRATIONS_TABLE}")
+        return {row[0] for row in cursor.fetchall()}
+
+
+# Pisahkan "schema.tabel"; tanpa schema berarti database koneksi
+def _split_table(cursor, table):
+    if "." in table:
+        return tuple(table.split(".", 1))
+    cursor.execute("SELECT DATABASE()")
+    return cursor.fetchone()[0], table
+
+
+# Nama index yang sudah mencakup `columns` sebagai kolom terdepan (termasuk PRIMARY), atau None
+def _existing_index(cursor, schema, table, columns):
+    cursor.execute(
+        """
+        SELECT INDEX_NAME, COLUMN_NAME FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+        ORDER BY INDEX_NAME, SEQ_IN_INDEX
+        """,
+        (schema, table),
+    )
+    indexes = {}
+    for index_name, column in cursor.fetchall():
+        indexes.setdefault(index_name, []).append(column.lower())
+    wanted = [column.lower() for column in columns]
+    for index_name, index_columns in indexes.items():
+        if index_columns[:len(wanted)] == wanted:
+            return index_name
+    return None
+
+
+def _table_exists(cursor, schema, table):
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.TABLES WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s",
+        (schema, table),
+    )
+    return cursor.fetchone()[0] > 0
+
+
+def _column_exists(cursor, schema, table, column):
+    cursor.execute(
+        """
+        SELECT COUNT(*) FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        """,
+        (schema, table, column),
+    )
+    return cursor.fetchone()[0] > 0
+
+
+# Tambahkan kolom jika belum ada; mengembalikan True jika kolom baru dibuat
+def ensure_column(conn, table, column, definition):
+    with conn.cursor() as cursor:
+        schema, name = _split_table(cursor, table)
+        if not _table_exists(cursor, schema, name):
+            raise ValueError(f"Kesalahan saat migrasi: tabel {schema}.{name} tidak ditemukan.")
+        if _column_exists(cursor, schema, name, column):
+            return False
+        cursor.execute(f"ALTER TABLE `{schema}`.`{name}` ADD COLUMN `{column}` {definition}")
+    return True
+
+
+# Buat index jika belum ada index dengan kolom terdepan yang sama; mengembalikan True jika index baru dibuat
+def ensure_index(conn, table, index_name, columns):
+    with conn.cursor() as cursor:
+        schema, name = _split_table(cursor, table)
+        if not _table_exists(cursor, schema, name):
+            raise ValueError(f"Kesalahan saat migrasi: tabel {schema}.{name} tidak ditemukan.")
+        if _existing_index(cursor, schema, name, columns):
+            return False
+        column_list = ", ".join(f"`{column}`" for column in columns)
+        cursor.execute(f"CREATE INDEX `{index_name}` ON `{schema}`.`{name}` ({column_list})")
+    return True
+
+
+# Jalankan migrasi yang belum tercatat, berurutan menurut versi
+def migrate(conn, log=print):
+    ensure_migrations_table(conn)
+    done = applied_versions(conn)
+    for version, name, steps, *column_steps in MIGRATIONS:
+        if version in done:
+            continue
+        for table, column, definition in (column_steps[0] if column_steps else []):
+            created = ensure_column(conn, table, column, definition)
+            log(f"{'Menambahkan' if created else 'Sudah ada'} kolom {column} pada {table}")
+        for table, index_name, columns in steps:
+            created = ensure_index(conn, table, index_name, columns)
+            log(f"{'Membuat' if created else 'Sudah ada index untuk'} {index_name} pada {table}")
+        with conn.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {MIGRATIONS_TABLE} (version, name) VALUES (%s, %s)", (version, name))
+        conn.commit()
+        log(f"Migrasi {version} selesai: {name}")
+
+
+# Query halaman yang diperiksa dengan EXPLAIN: (halaman, nama, sql, parameter)
+# Setiap query dibangun dengan builder yang sama dengan yang dipanggil halaman, sehingga yang diperiksa
+# selalu teks SQL yang benar-benar dijalankan. Parameter contoh diambil dari tanggal acuan; isinya tidak
+# memengaruhi rencana akses index. Sidik dan hierarki pprp Flight Utilization sengaja membaca seluruh tabel
+# (sekali per upload), sehingga tidak ikut diperiksa.
+def page_queries(tanggal):
+    start, end = tanggal - timedelta(days=6), tanggal
+    yoy_ranges = [
+        (first, last) for _, first, last in year_ranges([tanggal.year - 1, tanggal.year], month=tanggal.month)
+    ]
+    season = {"start_date": start, "end_date": end}
+    # Halaman pertama dan halaman lanjutan (keyset) Data view memakai rencana akses berbeda
+    column_list = select_list([])
+    return [
+        ("Data Realisasi", "traffic harian",
+         *mysql_query("flights", tanggal, tanggal, FLIGHT_COLUMNS, *airport_where("WARR"))),
+        ("Data Realisasi", "year-over-year",
+         daily_movements_sql(len(yoy_ranges)), daily_movements_params(yoy_ranges, "REGULER")),
+        ("Data Planning", "baris pprp harian", *mysql_query("pprp", tanggal, tanggal, DAY_COLUMNS)),
+        ("Data view", "jumlah baris", *count_query(start, end)),
+        ("Data view", "jumlah baris per bandara", *count_query(start, end, {"ADEP": "WARR"})),
+        ("Data view", "halaman pertama", *page_query(column_list, start, end)),
+        ("Data view", "halaman lanjutan", *page_query(column_list, start, end, after=(start, 0))),
+        ("Flight Utilization", "izin musim", named_query("utilization.permitted"), season),
+        ("Flight Utilization", "realisasi musim", named_query("utilization.realised"), season),
+        ("Infografis harian", "movement bandara", named_query("infografis.movements"), season),
+    ]
+
+
+# Baris EXPLAIN sebagai dict (kolom table, type, key, rows, ...)
+def explain(conn, sql, params=None):
+    with conn.cursor() as cursor:
+        cursor.execute(f"EXPLAIN {sql}", params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+# Periksa rencana akses setiap query halaman; mengembalikan daftar (halaman, nama, tabel) yang full table scan
+# Jalankan pada database dengan data representatif: pada tabel kosong MySQL bisa memilih scan apa pun index-nya
+def check(conn, tanggal=None, log=print):
+    full_scans = []
+    for page, name, sql, params in page_queries(tanggal or date.today()):
+        for row in explain(conn, sql, params):
+            scan = row.get("type") == "ALL"
+            log(f"{'SCAN' if scan else 'OK  '} {page} / {name}: {row.get('table')} "
+                f"type={row.get('type')} key={row.get('key')} rows={row.get('rows')}")
+            if scan:
+                full_scans.append((page, name, row.get("table")))
+    return full_scans
+
+
+if __name__ == "__main__":
+    # Perintah: python migrations.py migrate | python migrations.py check [YYYY-MM-DD]
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command == "migrate":
+        with connection() as conn:
+            migrate(conn)
+    elif command == "check":
+        tanggal = date.fromisoformat(sys.argv[2]) if len(sys.argv) > 2 else None
+        with connection() as conn:
+            full_scans = check(conn, tanggal)
+        if full_scans:
+            print(f"GAGAL: {len(full_scans)} akses tabel memakai full table scan")
+            sys.exit(1)
+        print("Semua query halaman memakai index")
+    else:
+        print("Penggunaan: python migrations.py migrate | python migrations.py check [YYYY-MM-DD]")
+        sys.exit(2)
@@ -1,54 +1,17 @@
 import streamlit as st
-import pymysql
-import pandas as pd
-from datetime import datetime,timedelta
+from datetime import datetime
 import matplotlib.pyplot as plt
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
-def create_connection():
-    secrets = st.secrets["mysql"]
-    return pymysql.connect(
-        host=secrets["host"],
-        user=secrets["username"],
-        password=secrets["password"],
-        database=secrets["database"],
-        port=secrets["port"]
-    )
+from instrumentation import debug_panel, render, set_page
+from planning import filter_flights, session_day
 
-# Query data
-def run_query(query):
-    conn = create_connection()
-    try:
-        df = pd.read_sql(query, conn)
-    finally:
-        conn.close()
-    return df
-
-# Fungsi untuk konversi waktu
-def convert_to_time(reference_time, value):
-    if pd.isna(value):  # Jika nilai NaN atau None
-        return None
-    if isinstance(value, str):  # Jika nilai berupa string
-        if "minute" in value:
-            minutes = int(value.split()[0])
-            return reference_time + timedelta(minutes=minutes)
-        elif "hour" in value:
-            hours = int(value.split()[0])
-            return reference_time + timedelta(hours=hours)
-        elif "day" in value:
-            days = int(value.split()[0])
-            return reference_time + timedelta(days=days)
-        else:
-            return None
-    elif isinstance(value, pd.Timedelta):  # Jika nilai berupa Timedelta
-        return reference_time + value
-    else:
-        return None  # Jika tipe data lain, abaikan
 
 # Streamlit UI
 st.set_page_config(layout="wide", page_title="Data Planning", page_icon="✈️")
+set_page("Data Planning")
 
 # 1. Menambahkan Border Hitam pada Header menggunakan HTML dan CSS
 header_html = """
@@ -60,21 +23,7 @@ st.markdown(header_html, unsafe_allow_html=True)
 
 # Sidebar for date selection
 st.sidebar.header("Select Date")
-tanggal_query = "SELECT DISTINCT tanggal FROM pprp ORDER BY tanggal ASC"
-tanggal_df = run_query(tanggal_query)
-tanggal_options = [
-    pd.to_datetime(date, errors='coerce').date() if pd.notnull(date) else None
-    for date in tanggal_df["tanggal"].tolist()
-]
-
-# Hapus nilai None atau NaT dari tanggal_options
-tanggal_options = [date for date in tanggal_options if date is not None]
-
-# Pastikan ada setidaknya satu tanggal yang valid
-if not tanggal_options:
-    tanggal_options = [datetime.now().date()]  # Jika tidak ada tanggal valid, gunakan tanggal sekarang
-
-# Pilihan tanggal dari sidebar, gunakan tanggal pertama jika ada, atau default ke hari ini
+# Pilihan tanggal dari sidebar, default ke hari ini
 selected_date = st.sidebar.date_input(
     "Tanggal", 
     value=datetime.now().date()
@@ -91,25 +40,15 @@ st.markdown(date_html, unsafe_allow_html=True)
 # 3. Menambahkan Garis Pembatas
 st.markdown("<hr style='border:1px solid black'>", unsafe_allow_html=True)
 
-query = f"""  
-    SELECT
-        COUNT(*) AS total_movements,          -- Menghitung total baris (movement)
-        COUNT(DISTINCT RUTE) AS total_routes, -- Menghitung jumlah rute unik
-        COUNT(DISTINCT IATA_CODE) AS total_airlines -- Menghitung jumlah maskapai unik berdasarkan ICAO_AIRLINE
-    FROM
-        sub_flight_db_2.pprp
-    WHERE
-        TANGGAL = '{selected_date}'
-    """
-# Eksekusi query
-conn = create_connection()
-result=run_query(query)
+# Semua data halaman dihitung dari satu query baris pprp tanggal terpilih, disimpan di session per tanggal
+day = session_day(selected_date)
+kpis = day["kpis"]
 # Menampilkan hasil ke dalam kotak Streamlit
 
-if not result.empty:
-    total_movements = result['total_movements'][0]
-    total_routes = result['total_routes'][0]
-    total_airlines = result['total_airlines'][0]
+if kpis:
+    total_movements = kpis['total_movements']
+    total_routes = kpis['total_routes']
+    total_airlines = kpis['total_airlines']
 
     # Menampilkan data dalam format kotak
     col1, col2, col3 = st.columns(3)
@@ -144,46 +83,8 @@ if not result.empty:
 # Menambahkan jarak antara kotak dan expander
 st.markdown("<br>", unsafe_allow_html=True)
 
-# Query untuk mengambil data dengan nomor urut
-movement_query = f"""
-    SELECT 
-        p.TANGGAL, 
-        p.RUTE,
-        a.AIRLINE_NAME,
-        p.FLIGHT_NUMBER,  
-        p.ETD, 
-        p.ETA, 
-        p.TYPE
-    FROM 
-        sub_flight_db_2.pprp p
-    LEFT JOIN 
-        sub_flight_db_2.airlines a ON p.ICAO_AIRLINE = a.ICAO_CODE
-    WHERE 
-        p.TANGGAL = '{selected_date}'
-"""
-# Menjalankan query menggunakan pandas
-movements_df = pd.read_sql_query(movement_query, conn)
-
-# Fungsi untuk mengonversi waktu menjadi HH:MM
-def convert_to_time(timedelta_obj):
-    try:
-        # Mengambil hanya jam dan menit dari timedelta
-        total_seconds = timedelta_obj.total_seconds()
-        hours = int(total_seconds // 3600)
-        minutes = int((total_seconds % 3600) // 60)
-        # Menampilkan jam dan menit dalam format "HH:MM"
-        return f"{hours:02}:{minutes:02}"
-    except Exception as e:
-        return None  # Jika konversi gagal, kembalikan None
-    
-# Mengonversi kolom ETD dan ETA menjadi timedelta (dari HH:MM:SS)
-movements_df['ETD'] = pd.to_timedelta(movements_df['ETD'])
-movements_df['ETA'] = pd.to_timedelta(movements_df['ETA'])
-
-# Mengonversi kolom ETD dan ETA menjadi HH:MM
-movements_df["ETD"] = movements_df["ETD"].apply(lambda x: convert_to_time(x))
-movements_df["ETA"] = movements_df["ETA"].apply(lambda x: convert_to_time(x))
-conn.close()
+# Daftar movement dengan nama maskapai, ETD/ETA sudah dalam format HH:MM
+movements_df = day["movements"]
 
 # Menampilkan data dalam bentuk tabel
 if not movements_df.empty:
@@ -193,50 +94,10 @@ else:
     st.write("Tidak ada data untuk tanggal yang dipilih.")
 
 #============================visual2==============
-# Membuat koneksi ke database
-conn = create_connection()
-
-# Query untuk mendapatkan frekuensi arrival dan departure per jam
-barchart_query = f"""
-    SELECT 
-        HOUR(
-            CASE
-                WHEN ARR_ICAO = 'WARR' THEN ETA
-                WHEN DEP_ICAO = 'WARR' THEN ETD
-                ELSE NULL
-            END
-        ) AS hour,
-        SUM(CASE WHEN ARR_ICAO = 'WARR' THEN 1 ELSE 0 END) AS arrival_count,
-        SUM(CASE WHEN DEP_ICAO = 'WARR' THEN 1 ELSE 0 END) AS departure_count
-    FROM 
-        sub_flight_db_2.pprp
-    WHERE 
-        TANGGAL = '{selected_date}'
-    GROUP BY 
-        hour
-    ORDER BY 
-        hour
-"""
-
-# Query untuk mendapatkan perbandingan international vs domestic berdasarkan TYPE
-piechart_query = f"""
-    SELECT 
-        TYPE, 
-        COUNT(*) AS frequency
-    FROM 
-        sub_flight_db_2.pprp
-    WHERE 
-        TANGGAL = '{selected_date}'
-    GROUP BY 
-        TYPE;
-"""
-
-# Menjalankan query menggunakan pandas
-barchart_df = pd.read_sql_query(barchart_query, conn)
-piechart_df = pd.read_sql_query(piechart_query, conn)
+# Frekuensi arrival dan departure per jam serta perbandingan international vs domestic berdasarkan TYPE
+barchart_df = day["hourly"]
+piechart_df = day["types"]
 
-# Menutup koneksi
-conn.close()
 max_arrival = barchart_df['arrival_count'].max()
 max_departure = barchart_df['departure_count'].max()
 # Membuat subplot dengan 1 baris, 2 kolom (rasio 3:1 antara Barchart dan Piechart)
@@ -297,46 +158,14 @@ fig.update_layout(
 )
 
 # Menampilkan grafik di Streamlit
-st.plotly_chart(fig)
+render(st.plotly_chart, fig, name="grafik movement per jam")
 #=================visualisasi 3=================
-movement_query2 = f"""
-    (SELECT 
-        IATA_CODE AS category,
-        'Maskapai' AS type,
-        COUNT(*) AS total_movements
-    FROM 
-        sub_flight_db_2.pprp
-    WHERE 
-        TANGGAL = '{selected_date}'
-    GROUP BY 
-        IATA_CODE)
-
-    UNION ALL
-
-    (SELECT 
-        RUTE AS category,
-        'Rute' AS type,
-        COUNT(*) AS total_movements
-    FROM 
-        sub_flight_db_2.pprp
-    WHERE 
-        TANGGAL = '{selected_date}'
-    GROUP BY 
-        RUTE)
-"""
-
-# Membuat koneksi ke database dan menjalankan query
-conn = create_connection()
-movement_df2 = pd.read_sql_query(movement_query2, conn)
-conn.close()
-
 # Membuat 2 kolom untuk menampilkan konten
 col1, col2 = st.columns(2)
 
 # Bar Chart untuk Total Movement berdasarkan Maskapai (ICAO_AIRLINE)
 with col1:
-    maskapai_df = movement_df2[movement_df2['type'] == 'Maskapai']
-    maskapai_df = maskapai_df.sort_values(by='total_movements', ascending=False)
+    maskapai_df = day["airlines"]
     fig1 = go.Figure()
     fig1.add_trace(go.Bar(
         x=maskapai_df['category'],
@@ -356,12 +185,11 @@ with col1:
         bargap=0.2,  # Jarak antar bar
         xaxis_rangeslider_visible=False,  # Menambahkan slider untuk sumbu X
     )
-    st.plotly_chart(fig1)
+    render(st.plotly_chart, fig1, name="grafik per maskapai")
 
 # Bar Chart untuk Total Movement berdasarkan Rute (RUTE)
 with col2:
-    rute_df = movement_df2[movement_df2['type'] == 'Rute']
-    rute_df = rute_df.sort_values(by='total_movements', ascending=False)
+    rute_df = day["routes"]
     fig2 = go.Figure()
     fig2.add_trace(go.Bar(
         x=rute_df['category'],
@@ -381,62 +209,9 @@ with col2:
         bargap=0.2,  # Jarak antar bar
         xaxis_rangeslider_visible=False,
     )
-    st.plotly_chart(fig2)
+    render(st.plotly_chart, fig2, name="grafik per rute")
 
 #=============expander==================
-exp1_query = f"""
-    SELECT 
-        HOUR(
-            CASE
-                WHEN ARR_ICAO = 'WARR' THEN ETA
-                WHEN DEP_ICAO = 'WARR' THEN ETD
-                ELSE NULL
-            END
-        ) AS hour,
-        FLIGHT_NUMBER,
-        IATA_CODE,
-        ETD,
-        ETA,
-        TYPE,
-        RUTE
-    FROM 
-        sub_flight_db_2.pprp
-    WHERE 
-        TANGGAL = '{selected_date}'
-    ORDER BY 
-        hour
-"""
-conn = create_connection()
-exp1_df = pd.read_sql_query(exp1_query, conn)
-conn.close()
-
-# Mengonversi kolom ETD dan ETA menjadi timedelta (dari HH:MM:SS)
-exp1_df['ETD'] = pd.to_timedelta(exp1_df['ETD'])
-exp1_df['ETA'] = pd.to_timedelta(exp1_df['ETA'])
-
-# Mengonversi kolom ETD dan ETA menjadi HH:MM
-exp1_df["ETD"] = exp1_df["ETD"].apply(lambda x: convert_to_time(x))
-exp1_df["ETA"] = exp1_df["ETA"].apply(lambda x: convert_to_time(x))
-
-# Query untuk mendapatkan daftar maskapai dan rute yang tersedia untuk selected_date
-airlines_query = f"""
-    SELECT DISTINCT IATA_CODE
-    FROM sub_flight_db_2.pprp
-    WHERE TANGGAL = '{selected_date}'
-"""
-
-routes_query = f"""
-    SELECT DISTINCT RUTE
-    FROM sub_flight_db_2.pprp
-    WHERE TANGGAL = '{selected_date}'
-"""
-
-# Membuat koneksi ke database dan menjalankan query untuk mendapatkan maskapai dan rute
-conn = create_connection()
-airlines_df = pd.read_sql_query(airlines_query, conn)
-routes_df = pd.read_sql_query(routes_query, conn)
-conn.close()
-
 # Menampilkan kolom untuk filter
 col1, col2, col3 = st.columns(3)
 
@@ -468,13 +243,13 @@ with col3:
 
 # Menambahkan filter untuk maskapai
 if additional_filter == "Airline":
-    selected_airlines = st.multiselect("Pilih Maskapai", airlines_df['IATA_CODE'].tolist(), default=airlines_df['IATA_CODE'].tolist())
+    selected_airlines = st.multiselect("Pilih Maskapai", day["airline_options"], default=day["airline_options"])
 else:
     selected_airlines = None  # Jika tidak memilih filter airline
 
 # Menambahkan filter untuk rute
 if additional_filter == "Rute":
-    selected_routes = st.multiselect("Pilih Rute", routes_df['RUTE'].tolist(), default=routes_df['RUTE'].tolist())
+    selected_routes = st.multiselect("Pilih Rute", day["route_options"], default=day["route_options"])
 else:
     selected_routes = None  # Jika tidak memilih filter route
 
@@ -482,22 +257,13 @@ else:
 start_hour = f"{hour_filter[0]:02}:00"
 end_hour = f"{hour_filter[1]:02}:59"
 
-# Menentukan filter berdasarkan tipe penerbangan
-if flight_type == "All":
-    filtered_df = exp1_df[(exp1_df['hour'] >= hour_filter[0]) & (exp1_df['hour'] <= hour_filter[1])]
-elif flight_type == "Domestik":
-    filtered_df = exp1_df[(exp1_df['hour'] >= hour_filter[0]) & (exp1_df['hour'] <= hour_filter[1]) & (exp1_df['TYPE'] == "domestik")]
-else:  # Internasional
-    filtered_df = exp1_df[(exp1_df['hour'] >= hour_filter[0]) & (exp1_df['hour'] <= hour_filter[1]) & (exp1_df['TYPE'] == "internasional")]
-
-# Menambahkan filter berdasarkan Maskapai dan Rute
-if selected_airlines:
-    filtered_df = filtered_df[filtered_df['IATA_CODE'].isin(selected_airlines)]
-
-if selected_routes:
-    filtered_df = filtered_df[filtered_df['RUTE'].isin(selected_routes)]
+# Menentukan filter berdasarkan jam, tipe penerbangan, Maskapai dan Rute (lookup index, tanpa query ulang)
+filtered_df = filter_flights(day, hour_filter, flight_type, selected_airlines, selected_routes)
 
 # Menambahkan satu expander untuk data
 with st.expander(f"Klik untuk melihat data movement per jam dan data domestic/international antara {start_hour} - {end_hour}"):
     st.write(f"Data movement per jam (terfilter oleh jam {start_hour} - {end_hour}, tipe {flight_type}, dan filter {additional_filter}):")
-    st.dataframe(filtered_df)  # Menampilkan data movement per jam yang terfilter
\ No newline at end of file
+    st.dataframe(filtered_df)  # Menampilkan data movement per jam yang terfilter
+
+# Waktu query dan render halaman ini (panel muncul jika [instrumentation] panel = true)
+debug_panel()
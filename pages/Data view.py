@@ -1,35 +1,28 @@
 import streamlit as st
-import pymysql
-import pandas as pd
 from datetime import datetime
 
-def create_connection():
-    secrets = st.secrets["mysql"]
-    return pymysql.connect(
-        host=secrets["host"],
-        user=secrets["username"],
-        password=secrets["password"],
-        database=secrets["database"],
-        port=secrets["port"]
-    )
-
-# Query data
-def run_query(query):
-    conn = create_connection()
-    try:
-        df = pd.read_sql(query, conn)
-    finally:
-        conn.close()
-    return df
+from export import EXPORT_FORMATS, export_flights
+from flights_browser import FILTER_COLUMNS, KEY_COLUMNS, PAGE_SIZES, count_flights, fetch_page, flight_columns, page_cursor
+from instrumentation import debug_panel, set_page
+
 
 # Streamlit UI
 st.title("Flights Data Viewer")
+set_page("Data view")
 
 # Date filters
 st.sidebar.header("Filter by Date")
 start_date = st.sidebar.date_input("Start Date", datetime(2023, 1, 1))
 end_date = st.sidebar.date_input("End Date", datetime(2023, 12, 31))
 
+# Filter dan pilihan tampilan (diproses di server, hanya satu halaman yang diambil)
+st.sidebar.header("Filter & Kolom")
+filters = {column: st.sidebar.text_input(column).strip().upper() for column in FILTER_COLUMNS}
+all_columns = flight_columns()
+columns = st.sidebar.multiselect("Kolom", all_columns, default=all_columns)
+descending = st.sidebar.radio("Urutan tanggal", ["Terlama", "Terbaru"]) == "Terbaru"
+page_size = st.sidebar.selectbox("Baris per halaman", PAGE_SIZES, index=1)
+
 # Validate date range
 if start_date > end_date:
     st.error("Error: Start date must be earlier than end date.")
@@ -38,18 +31,65 @@ else:
     start_date_str = start_date.strftime('%Y-%m-%d')
     end_date_str = end_date.strftime('%Y-%m-%d')
 
-    # Query with date filter
-    query = f"""
-        SELECT * FROM flights 
-        WHERE tanggal_dummy BETWEEN '{start_date_str}' AND '{end_date_str}';
-    """
+    # Tumpukan kunci halaman per sesi; kembali ke halaman pertama jika filter berubah
+    view_key = (start_date, end_date, tuple(filters.items()), descending, page_size)
+    state = st.session_state.get("data_view")
+    if state is None or state["key"] != view_key:
+        state = {"key": view_key, "cursors": [None]}
+        st.session_state["data_view"] = state
 
-    # Run query
-    df = run_query(query)
+    total = count_flights(start_date, end_date, filters)
+    df = fetch_page(start_date, end_date, columns, filters=filters, descending=descending,
+                    after=state["cursors"][-1], page_size=page_size)
+    page_number = len(state["cursors"])
+    last_page = max(1, -(-total // page_size))
 
     # Display results
     if not df.empty:
-        st.write(f"Displaying flights from {start_date_str} to {end_date_str}:")
-        st.dataframe(df)
+        st.write(f"Displaying flights from {start_date_str} to {end_date_str}: "
+                 f"{total:,} rows, page {page_number} of {last_page}")
+        st.dataframe(df[[column for column in df.columns if column in columns or column not in KEY_COLUMNS]])
     else:
-        st.write(f"No flights found between {start_date_str} and {end_date_str}.")
\ No newline at end of file
+        st.write(f"No flights found between {start_date_str} and {end_date_str}.")
+
+    col1, col2 = st.columns(2)
+    if col1.button("Sebelumnya", disabled=page_number == 1):
+        state["cursors"].pop()
+        st.experimental_rerun()
+    if col2.button("Berikutnya", disabled=page_number >= last_page or len(df) < page_size):
+        state["cursors"].append(page_cursor(df))
+        st.experimental_rerun()
+
+    # Ekspor seluruh rentang terfilter ke CSV/Parquet, ditulis per chunk dari cursor server-side
+    with st.expander("Ekspor data"):
+        export_format = st.radio("Format", EXPORT_FORMATS, format_func=str.upper, horizontal=True)
+        if "parquet" not in EXPORT_FORMATS:
+            st.caption("Parquet membutuhkan paket pyarrow.")
+        if st.button("Siapkan file"):
+            # Hasil ekspor sebelumnya di sesi ini dibuang dulu
+            st.session_state.pop("data_view_export", None)
+            progress_text = st.empty()
+            try:
+                data, rows = export_flights(
+                    start_date, end_date, columns, filters=filters, fmt=export_format, descending=descending,
+                    on_progress=lambda rows: progress_text.write(f"{rows:,} baris ditulis..."),
+                )
+                st.session_state["data_view_export"] = {
+                    "data": data, "rows": rows, "format": export_format,
+                    "name": f"flights_{start_date_str}_{end_date_str}.{export_format}",
+                }
+                progress_text.write(f"{rows:,} baris siap diunduh.")
+            except Exception as e:
+                st.error(f"Kesalahan saat mengekspor data: {e}")
+
+        export = st.session_state.get("data_view_export")
+        if export is not None:
+            st.download_button(
+                f"Unduh {export['name']} ({export['rows']:,} baris)",
+                data=export["data"],
+                file_name=export["name"],
+                mime="text/csv" if export["format"] == "csv" else "application/octet-stream",
+            )
+
+# Waktu query dan render halaman ini (panel muncul jika [instrumentation] panel = true)
+debug_panel()
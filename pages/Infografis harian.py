@@ -1,28 +1,14 @@
 import streamlit as st
-import pymysql
 import pandas as pd
 import folium
 from streamlit_folium import folium_static
 from datetime import datetime
 
-def create_connection():
-    secrets = st.secrets["mysql"]
-    return pymysql.connect(
-        host=secrets["host"],
-        user=secrets["username"],
-        password=secrets["password"],
-        database=secrets["database"],
-        port=secrets["port"]
-    )
+from instrumentation import debug_panel, render, set_page
+from queries import run_named
+from rollup import read_airport_counts, rollup_enabled
+from traffic import airport_movement_counts
 
-# Query data
-def run_query(query):
-    conn = create_connection()
-    try:
-        df = pd.read_sql(query, conn)
-    finally:
-        conn.close()
-    return df
 
 # Bandara Jawa Timur dan koordinatnya
 airports = {
@@ -37,6 +23,7 @@ airports = {
 
 # Streamlit UI
 st.title("Flights Movement Visualization in East Java Airports")
+set_page("Infografis harian")
 
 # Date filters
 st.sidebar.header("Filter by Date")
@@ -47,37 +34,19 @@ end_date = st.sidebar.date_input("End Date", datetime(2025, 1, 1))
 if start_date > end_date:
     st.error("Error: Start date must be earlier than end date.")
 else:
-    # Format dates for SQL query
-    start_date_str = start_date.strftime('%Y-%m-%d')
-    end_date_str = end_date.strftime('%Y-%m-%d')
-
-    # Query to calculate movements
-    query = f"""
-        SELECT 
-            flights.ADEP, flights.ADES, flights.STATUS_FLIGHT, flights.DEP_ARR_LOCAL
-        FROM flights 
-        WHERE tanggal_dummy BETWEEN '{start_date_str}' AND '{end_date_str}';
-    """
-
-    # Run query
-    df = run_query(query)
-
-    # Initialize movement counts
-    movement_data = {icao: {"REGULER": 0, "IRREGULER": 0, "TOTAL": 0} for icao in airports}
-
-    # Process data
-    for _, row in df.iterrows():
-        locations = [row["ADEP"], row["ADES"]]
-        for loc in locations:
-            if loc in movement_data:
-                category = "REGULER" if row["STATUS_FLIGHT"] == "REGULER" else "IRREGULER"
-                movement_data[loc][category] += 1
-                movement_data[loc]["TOTAL"] += 1
-
-                # Add extra movement if DEP_ARR_LOCAL is 'L'
-                if row["DEP_ARR_LOCAL"] == "L":
-                    movement_data[loc][category] += 1
-                    movement_data[loc]["TOTAL"] += 1
+    if rollup_enabled():
+        # Baca hitungan dari rollup harian tanpa memindai tabel flights
+        movement_data = read_airport_counts(start_date, end_date, airports).to_dict(orient="index")
+    else:
+        # Query to calculate movements
+        df = run_named(
+            "infografis.movements",
+            {"start_date": start_date, "end_date": end_date},
+            dates=[(start_date, end_date)],
+        )
+
+        # Hitung movement per bandara secara vektor
+        movement_data = airport_movement_counts(df, airports).to_dict(orient="index")
 
     # Create a map
     m = folium.Map(location=[-7.536, 112.238], zoom_start=8)
@@ -100,7 +69,7 @@ else:
         ).add_to(m)
 
     # Display map
-    folium_static(m)
+    render(folium_static, m, name="peta bandara")
 
     # Create movement detail table
     table_data = []
@@ -114,4 +83,7 @@ else:
 
     movement_df = pd.DataFrame(table_data)
     st.subheader("Movement Details")
-    st.dataframe(movement_df)
\ No newline at end of file
+    st.dataframe(movement_df)
+
+# Waktu query dan render halaman ini (panel muncul jika [instrumentation] panel = true)
+debug_panel()
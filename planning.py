@@ -0,0 +1,155 @@
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from snapshot import load_table
+from time_utils import to_hhmm, to_timedelta
+
+# Model satu hari Data Planning: baris pprp hari itu diambil sekali, semua ringkasan dihitung di memori
+AIRPORT = "WARR"
+
+# Pilihan "Pilih Tipe Penerbangan" dan nilai TYPE di pprp
+TYPE_FILTERS = {"Domestik": "domestik", "Internasional": "internasional"}
+
+# Kolom pprp (dengan AIRLINE_NAME dari airlines) yang dipakai semua ringkasan satu hari
+DAY_COLUMNS = ["TANGGAL", "RUTE", "IATA_CODE", "ICAO_AIRLINE", "AIRLINE_NAME", "FLIGHT_NUMBER",
+               "ETD", "ETA", "TYPE", "ARR_ICAO", "DEP_ICAO"]
+
+
+# Ambil semua baris pprp untuk satu tanggal beserta nama maskapai
+# airlines dikelompokkan per ICAO_CODE agar kode ganda tidak menggandakan baris pprp
+def fetch_day_rows(selected_date):
+    return load_table("pprp", selected_date, selected_date, columns=DAY_COLUMNS)
+
+
+# Jam movement di bandara: jam ETA untuk arrival, jam ETD untuk departure (sama dengan HOUR(CASE ...) di SQL)
+def movement_hour(rows, airport=AIRPORT):
+    arrival = (rows["ARR_ICAO"] == airport).to_numpy()
+    departure = (rows["DEP_ICAO"] == airport).to_numpy()
+    seconds = np.where(
+        arrival,
+        to_timedelta(rows["ETA"]).dt.total_seconds().to_numpy(),
+        np.where(departure, to_timedelta(rows["ETD"]).dt.total_seconds().to_numpy(), np.nan),
+    )
+    hour = pd.Series(seconds // 3600, index=rows.index, name="hour")
+    # Tanpa nilai kosong kolom jam tetap integer seperti hasil query sebelumnya
+    return hour.astype(int) if hour.notna().all() else hour
+
+
+# Jumlah movement per kategori, urut dari yang terbanyak (kategori kosong ikut dihitung seperti GROUP BY)
+def _counts(values):
+    counts = values.value_counts(dropna=False).rename_axis("category").reset_index(name="total_movements")
+    return counts.sort_values("total_movements", ascending=False, kind="stable").reset_index(drop=True)
+
+
+# Hitung semua data halaman Data Planning dari baris pprp satu hari
+def day_model(rows, airport=AIRPORT):
+    hour = movement_hour(rows, airport)
+    is_arrival = (rows["ARR_ICAO"] == airport).astype(int)
+    is_departure = (rows["DEP_ICAO"] == airport).astype(int)
+    etd = to_hhmm(rows["ETD"])
+    eta = to_hhmm(rows["ETA"])
+
+    kpis = {
+        "total_movements": len(rows),
+        "total_routes": rows["RUTE"].nunique(),
+        "total_airlines": rows["IATA_CODE"].nunique(),
+    }
+
+    movements = pd.DataFrame({
+        "TANGGAL": rows["TANGGAL"],
+        "RUTE": rows["RUTE"],
+        "AIRLINE_NAME": rows["AIRLINE_NAME"],
+        "FLIGHT_NUMBER": rows["FLIGHT_NUMBER"],
+        "ETD": etd,
+        "ETA": eta,
+        "TYPE": rows["TYPE"],
+    })
+
+    hourly = (
+        pd.DataFrame({"hour": hour, "arrival_count": is_arrival, "departure_count": is_departure})
+        .groupby("hour", dropna=False).sum()
+        .reset_index()
+    )
+
+    types = rows["TYPE"].value_counts(dropna=False, sort=False).rename_axis("TYPE").reset_index(name="frequency")
+
+    # Daftar movement per jam untuk expander dan filter, urut jam (jam kosong di depan seperti ORDER BY MySQL)
+    flights = pd.DataFrame({
+        "hour": hour,
+        "FLIGHT_NUMBER": rows["FLIGHT_NUMBER"],
+        "IATA_CODE": rows["IATA_CODE"],
+        "ETD": etd,
+        "ETA": eta,
+        "TYPE": rows["TYPE"],
+        "RUTE": rows["RUTE"],
+    }).sort_values("hour", na_position="first", kind="stable").reset_index(drop=True)
+
+    return {
+        "kpis": kpis,
+        "movements": movements,
+        "hourly": hourly,
+        "types": types,
+        "airlines": _counts(rows["IATA_CODE"]),
+        "routes": _counts(rows["RUTE"]),
+        "flights": flights,
+        "flight_index": build_flight_index(flights),
+        "airline_options": rows["IATA_CODE"].drop_duplicates().tolist(),
+        "route_options": rows["RUTE"].drop_duplicates().tolist(),
+    }
+
+
+# Posisi baris per nilai kolom, nilai kosong dikumpulkan di kunci None
+def _positions_by(values):
+    positions = defaultdict(list)
+    for position, value in enumerate(values.tolist()):
+        positions[None if pd.isna(value) else value].append(position)
+    return {key: np.array(rows, dtype=np.intp) for key, rows in positions.items()}
+
+
+# Index posisi baris `flights` per jam, TYPE, maskapai, dan rute agar filter halaman cukup lookup
+def build_flight_index(flights):
+    return {column: _positions_by(flights[column]) for column in ["hour", "TYPE", "IATA_CODE", "RUTE"]}
+
+
+# Gabungan posisi untuk beberapa nilai; None jika filter tidak dipakai
+def _lookup(index, keys):
+    if keys is None:
+        return None
+    found = [index[key] for key in keys if key in index]
+    return np.concatenate(found) if found else np.array([], dtype=np.intp)
+
+
+# Filter daftar movement per jam: rentang jam (inklusif), tipe ("All"/"Domestik"/"Internasional"),
+# daftar maskapai dan rute (kosong atau None berarti tanpa filter); urutan baris tetap
+def filter_flights(day, hour_range, flight_type="All", airlines=None, routes=None):
+    index = day["flight_index"]
+    selections = [
+        _lookup(index["hour"], range(hour_range[0], hour_range[1] + 1)),
+        _lookup(index["TYPE"], [TYPE_FILTERS[flight_type]] if flight_type in TYPE_FILTERS else None),
+        _lookup(index["IATA_CODE"], [None if pd.isna(key) else key for key in airlines] if airlines else None),
+        _lookup(index["RUTE"], [None if pd.isna(key) else key for key in routes] if routes else None),
+    ]
+    positions = None
+    for selection in selections:
+        if selection is not None:
+            positions = selection if positions is None else np.intersect1d(positions, selection)
+    if positions is None:
+        return day["flights"]
+    return day["flights"].iloc[np.sort(positions)]
+
+
+# Model hari yang disimpan di session; filter widget hanya memicu rerun tanpa query ulang
+def session_day(selected_date, airport=AIRPORT):
+    cached = st.session_state.get("planning_day")
+    if cached is None or cached["key"] != (selected_date, airport):
+        cached = {"key": (selected_date, airport), "day": load_day(selected_date, airport)}
+        st.session_state["planning_day"] = cached
+    return cached["day"]
+
+
+# Satu query untuk satu tanggal, lalu semua ringkasan dihitung di memori
+def load_day(selected_date, airport=AIRPORT):
+    return day_model(fetch_day_rows(selected_date), airport)
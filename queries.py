@@ -0,0 +1,61 @@
+from analytics_backend import run_analytics
+from db import run_query
+from instrumentation import query_label
+
+# Repositori query bernama yang dipakai halaman. Teks SQL tetap (tidak pernah dirangkai dengan nilai),
+# semua nilai diikat lewat placeholder bernama %(nama)s, sehingga satu nama = satu teks SQL dan kunci
+# cache/metrik per query stabil untuk semua tanggal dan pilihan dropdown.
+# Query yang bentuknya bergantung pada jumlah rentang atau filter (yoy, flights_browser, rollup, snapshot)
+# dibangun di modulnya masing-masing, juga dengan parameter terikat.
+QUERIES = {
+    # Data Realisasi: daftar tanggal untuk pilihan tanggal
+    "realisasi.tanggal_options": """
+        SELECT DISTINCT tanggal_dummy FROM flights
+    """,
+    # Infografis harian: baris movement dalam rentang tanggal (tanpa rollup)
+    "infografis.movements": """
+        SELECT flights.ADEP, flights.ADES, flights.STATUS_FLIGHT, flights.DEP_ARR_LOCAL
+        FROM flights
+        WHERE tanggal_dummy BETWEEN %(start_date)s AND %(end_date)s
+    """,
+    # Flight Utilization: sidik pprp dan hierarki dropdown maskapai -> nomor penerbangan -> rute
+    "utilization.pprp_fingerprint": """
+        SELECT COUNT(*) AS total, MAX(TANGGAL) AS last_date FROM pprp
+    """,
+    "utilization.hierarchy": """
+        SELECT ICAO_AIRLINE, FLIGHT_NUMBER, RUTE
+        FROM pprp
+        GROUP BY ICAO_AIRLINE, FLIGHT_NUMBER, RUTE
+        ORDER BY ICAO_AIRLINE, FLIGHT_NUMBER, RUTE
+    """,
+    # Flight Utilization: izin dan realisasi per musim
+    "utilization.permitted": """
+        SELECT ICAO_AIRLINE, FLIGHT_NUMBER, RUTE, DEP_ICAO, ARR_ICAO, COUNT(*) AS permitted
+        FROM pprp
+        WHERE TANGGAL BETWEEN %(start_date)s AND %(end_date)s
+        GROUP BY ICAO_AIRLINE, FLIGHT_NUMBER, RUTE, DEP_ICAO, ARR_ICAO
+    """,
+    "utilization.realised": """
+        SELECT ACID, ICAO_CODE, ADEP, ADES, COUNT(*) AS realised
+        FROM flights
+        WHERE tanggal_dummy BETWEEN %(start_date)s AND %(end_date)s
+        GROUP BY ACID, ICAO_CODE, ADEP, ADES
+    """,
+}
+
+
+def named_query(name):
+    try:
+        return QUERIES[name]
+    except KeyError:
+        raise KeyError(f"Query '{name}' tidak ada di repositori query.") from None
+
+
+# Jalankan query bernama dengan parameter terikat (dict untuk placeholder %(nama)s)
+# `page` mengarahkan query ke backend analitik halaman tersebut; `dates` dan `cache` sama dengan run_query
+def run_named(name, params=None, dates=None, page=None, cache=True):
+    query = named_query(name)
+    with query_label(name):
+        if page is not None and cache:
+            return run_analytics(query, params, dates=dates, page=page)
+        return run_query(query, params, dates=dates, cache=cache)
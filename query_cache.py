@@ -0,0 +1,213 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+import pandas as pd
+import streamlit as st
+from pymysql.converters import escape_item
+
+# Nilai default cache hasil query, bisa ditimpa lewat st.secrets["query_cache"]
+DEFAULT_TTL = 300              # detik sebelum hasil dianggap basi
+DEFAULT_MAX_MB = 256           # batas total ukuran DataFrame yang disimpan
+
+
+# Kunci cache: SQL dengan spasi dirapikan (tanpa ';' di akhir) + parameter
+def normalize_sql(query):
+    return re.sub(r"\s+", " ", query).strip().rstrip(";").strip()
+
+
+# Parameter dikunci dengan literal SQL hasil escape pymysql, sehingga nilai yang terikat sama
+# (mis. date(2025, 1, 1) dan "2025-01-01") memakai entri cache yang sama
+def _param_literal(value):
+    return escape_item(value, "utf8mb4")
+
+
+def query_key(query, params=None):
+    if isinstance(params, dict):
+        params = tuple(sorted((name, _param_literal(value)) for name, value in params.items()))
+    elif isinstance(params, (list, tuple)):
+        params = tuple(_param_literal(value) for value in params)
+    elif params is not None:
+        params = _param_literal(params)
+    return normalize_sql(query), repr(params)
+
+
+# Ubah daftar tanggal atau rentang (awal, akhir) menjadi daftar rentang date
+def date_ranges(dates):
+    ranges = []
+    for value in dates:
+        if isinstance(value, (tuple, list)):
+            start, end = value
+        else:
+            start = end = value
+        ranges.append((pd.Timestamp(start).date(), pd.Timestamp(end).date()))
+    return ranges
+
+
+# Cache DataFrame bersama untuk semua sesi: TTL, LRU dengan batas byte, dan invalidasi per tanggal
+# - setiap bump() menaikkan versi; tanggal yang di-bump mencatat versi tersebut
+# - entri dengan tanggal basi jika salah satu tanggalnya di-bump setelah entri disimpan
+# - entri tanpa tanggal basi setelah bump() apa pun
+# - versi tanggal yang tidak lebih baru dari entri tertua dibuang, karena tidak bisa membuat entri mana pun basi;
+#   hasil dengan versi di bawah batas itu (query yang mulai sebelum bump) tidak disimpan
+class QueryCache:
+    def __init__(self, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # kunci -> (frame, ukuran, disimpan, versi, rentang tanggal)
+        self._bytes = 0
+        self._version = 0
+        self._date_versions = {}       # tanggal -> versi bump terakhir yang menyentuhnya
+        self._pruned_through = 0       # versi tanggal <= nilai ini sudah dibuang
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "invalidated": 0}
+
+    # Hanya tanggal milik entri yang diperiksa (atau semua versi tanggal jika jumlahnya lebih sedikit)
+    def _is_stale(self, stored_version, ranges):
+        if ranges is None or self._version == stored_version:
+            return self._version > stored_version
+        n_days = sum((end - start).days + 1 for start, end in ranges)
+        if n_days <= len(self._date_versions):
+            return any(
+                self._date_versions.get(start + timedelta(days=offset), 0) > stored_version
+                for start, end in ranges
+                for offset in range((end - start).days + 1)
+            )
+        return any(
+            version > stored_version and any(start <= day <= end for start, end in ranges)
+            for day, version in self._date_versions.items()
+        )
+
+    # Buang versi tanggal yang tidak lebih baru dari entri tertua yang masih berlaku
+    # (entri yang sudah lewat TTL tidak akan pernah dikembalikan get(), jadi tidak ikut menahan)
+    def _prune_date_versions(self):
+        now = time.monotonic()
+        oldest = min(
+            (version for _, _, stored_at, version, _ in self._entries.values() if now - stored_at <= self.ttl),
+            default=self._version,
+        )
+        if oldest <= self._pruned_through:
+            return
+        self._date_versions = {day: version for day, version in self._date_versions.items() if version > oldest}
+        self._pruned_through = oldest
+
+    def _drop(self, key):
+        _, size, _, _, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    # Ambil salinan hasil yang masih segar, atau None
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            frame, _, stored_at, stored_version, ranges = entry
+            if time.monotonic() - stored_at > self.ttl:
+                self._drop(key)
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            if self._is_stale(stored_version, ranges):
+                self._drop(key)
+                self._stats["invalidated"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+        return frame.copy()
+
+    # Simpan salinan hasil; `version` adalah current_version() sebelum query dijalankan agar
+    # hasil yang dibaca bersamaan dengan upload tidak dianggap segar
+    def put(self, key, frame, version, dates=None):
+        size = int(frame.memory_usage(index=True, deep=True).sum())
+        if size > self.max_bytes:
+            return
+        frame = frame.copy()
+        ranges = date_ranges(dates) if dates is not None else None
+        with self._lock:
+            # Versi tanggal yang bisa membuat hasil ini basi mungkin sudah dibuang
+            if version < self._pruned_through:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (frame, size, time.monotonic(), version, ranges)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._stats["evictions"] += 1
+
+    def current_version(self):
+        with self._lock:
+            return self._version
+
+    # Tandai data berubah; tanpa `dates` semua entri dianggap basi
+    def bump(self, dates=None):
+        with self._lock:
+            self._version += 1
+            if dates is None:
+                self._stats["invalidated"] += len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+                self._prune_date_versions()
+                return
+            for start, end in date_ranges(dates):
+                for day in pd.date_range(start, end).date:
+                    self._date_versions[day] = self._version
+            self._prune_date_versions()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["mb"] = round(self._bytes / (1024 * 1024), 2)
+            stats["version"] = self._version
+        stats["ttl"] = self.ttl
+        stats["max_mb"] = round(self.max_bytes / (1024 * 1024), 2)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+# Satu cache untuk semua sesi; None jika dimatikan lewat [query_cache] enabled = false
+@st.cache_resource
+def get_query_cache():
+    settings = st.secrets.get("query_cache", {})
+    if not settings.get("enabled", True):
+        return None
+    return QueryCache(
+        ttl=settings.get("ttl", DEFAULT_TTL),
+        max_bytes=int(settings.get("max_mb", DEFAULT_MAX_MB) * 1024 * 1024),
+    )
+
+
+# Dipanggil setelah upload: hasil query untuk tanggal yang berubah (dan query tanpa tanggal) dibuang
+def invalidate(dates=None):
+    cache = get_query_cache()
+    if cache is not None:
+        cache.bump(dates)
+
+
+# Versi data saat ini (naik setiap upload); None jika cache dimatikan
+def data_version():
+    cache = get_query_cache()
+    return cache.current_version() if cache is not None else None
+
+
+def cache_stats():
+    cache = get_query_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
+
+
+def clear_cache():
+    cache = get_query_cache()
+    if cache is not None:
+        cache.clear()
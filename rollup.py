@@ -0,0 +1,164 @@
+import sys
+
+import pandas as pd
+import streamlit as st
+
+from db import connection, run_query
+
+# Rollup harian tabel flights: tanggal x bandara x status x arah x jam
+# - setiap baris flights menyumbang satu baris DEP di ADEP (jam ATD) dan satu baris ARR di ADES (jam ATA)
+# - `flights` = jumlah baris, `movements` = jumlah dengan DEP_ARR_LOCAL = 'L' dihitung dua kali
+# - jam -1 berarti ATD/ATA kosong, status/bandara kosong disimpan sebagai ''
+ROLLUP_TABLE = "flights_daily_rollup"
+SOURCE_TABLE = "flights"
+
+
+def ensure_rollup_table(conn):
+    with conn.cursor() as cursor:
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {ROLLUP_TABLE} (
+                tanggal DATE NOT NULL,
+                airport VARCHAR(10) NOT NULL,
+                status VARCHAR(30) NOT NULL,
+                direction ENUM('DEP', 'ARR') NOT NULL,
+                hour TINYINT NOT NULL,
+                flights INT NOT NULL,
+                movements INT NOT NULL,
+                PRIMARY KEY (tanggal, airport, status, direction, hour),
+                KEY idx_airport_tanggal (airport, tanggal)
+            )
+        """)
+    conn.commit()
+
+
+# Hitung ulang rollup untuk tanggal yang memenuhi `predicate`
+# `predicate` memakai placeholder {column}, mis. "{column} BETWEEN %s AND %s", dan diterapkan pada
+# tanggal_dummy di flights serta tanggal di tabel rollup
+def _refresh(conn, predicate, params):
+    source_where = predicate.format(column="tanggal_dummy")
+    side = """
+        SELECT tanggal_dummy, COALESCE({airport}, ''), COALESCE(STATUS_FLIGHT, ''), '{direction}',
+               COALESCE(HOUR({time}), -1), COUNT(*),
+               SUM(CASE WHEN DEP_ARR_LOCAL = 'L' THEN 2 ELSE 1 END)
+        FROM {table}
+        WHERE {where}
+        GROUP BY tanggal_dummy, COALESCE({airport}, ''), COALESCE(STATUS_FLIGHT, ''), COALESCE(HOUR({time}), -1)
+    """
+    dep = side.format(airport="ADEP", direction="DEP", time="ATD", table=SOURCE_TABLE, where=source_where)
+    arr = side.format(airport="ADES", direction="ARR", time="ATA", table=SOURCE_TABLE, where=source_where)
+    with conn.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {ROLLUP_TABLE} WHERE {predicate.format(column='tanggal')}", params)
+        cursor.execute(
+            f"""
+            INSERT INTO {ROLLUP_TABLE} (tanggal, airport, status, direction, hour, flights, movements)
+            {dep}
+            UNION ALL
+            {arr}
+            """,
+            params + params,
+        )
+    conn.commit()
+
+
+# Hitung ulang rollup untuk tanggal tertentu (dipanggil setelah app.py menyimpan file cabang)
+def refresh_dates(conn, dates):
+    dates = sorted(dates)
+    if not dates:
+        return
+    placeholders = ", ".join(["%s" for _ in dates])
+    _refresh(conn, "{column} IN (" + placeholders + ")", tuple(dates))
+
+
+# Tanggal rollup (tanggal_dummy) yang terpengaruh oleh baris dengan TANGGAL tertentu
+def affected_dates(conn, tanggal_values):
+    tanggal_values = sorted(tanggal_values)
+    if not tanggal_values:
+        return []
+    placeholders = ", ".join(["%s" for _ in tanggal_values])
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"SELECT DISTINCT tanggal_dummy FROM {SOURCE_TABLE} WHERE TANGGAL IN ({placeholders})",
+            tuple(tanggal_values),
+        )
+        return [row[0] for row in cursor.fetchall() if row[0] is not None]
+
+
+# Perbarui rollup secara inkremental setelah satu file cabang dimuat
+# Mengembalikan tanggal_dummy yang dihitung ulang
+def refresh_after_ingest(conn, tanggal_values):
+    # Tanggal file sendiri tetap dihitung ulang agar baris rollup yang datanya terhapus (mode ganti) ikut hilang
+    dates = set(affected_dates(conn, tanggal_values)) | set(tanggal_values)
+    refresh_dates(conn, dates)
+    return dates
+
+
+# Bangun ulang seluruh rollup, per bulan agar transaksi tetap kecil
+def rebuild(conn, log=print):
+    ensure_rollup_table(conn)
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT MIN(tanggal_dummy), MAX(tanggal_dummy) FROM {SOURCE_TABLE}")
+        first, last = cursor.fetchone()
+        cursor.execute(f"DELETE FROM {ROLLUP_TABLE}")
+    conn.commit()
+    if first is None:
+        return
+
+    for month_start in pd.date_range(pd.Timestamp(first).replace(day=1), last, freq="MS"):
+        month_end = month_start + pd.offsets.MonthEnd(0)
+        _refresh(conn, "{column} BETWEEN %s AND %s", (month_start.date(), month_end.date()))
+        log(f"Rollup {month_start:%Y-%m} selesai")
+
+
+# Pembaca rollup untuk halaman
+
+# Rollup dipakai halaman hanya setelah diaktifkan ([rollup] enabled = true, setelah rebuild pertama)
+def rollup_enabled():
+    return st.secrets.get("rollup", {}).get("enabled", False)
+
+
+# Jumlah baris flights per rentang tanggal_dummy, opsional untuk satu bandara asal atau tujuan
+def read_flight_count(start_date, end_date, adep=None, ades=None):
+    if adep and ades:
+        raise ValueError("Rollup tidak bisa menghitung filter ADEP dan ADES sekaligus.")
+    direction, airport = ("ARR", ades) if ades else ("DEP", adep)
+    where = "tanggal BETWEEN %s AND %s AND direction = %s"
+    params = [start_date, end_date, direction]
+    if airport:
+        where += " AND airport = %s"
+        params.append(airport)
+    df = run_query(
+        f"SELECT COALESCE(SUM(flights), 0) AS total FROM {ROLLUP_TABLE} WHERE {where}",
+        tuple(params),
+        dates=[(start_date, end_date)],
+    )
+    return int(df["total"].iloc[0])
+
+
+# Movement REGULER/IRREGULER/TOTAL per bandara (sama dengan hitungan Infografis harian)
+def read_airport_counts(start_date, end_date, airports):
+    codes = list(airports)
+    placeholders = ", ".join(["%s" for _ in codes])
+    df = run_query(
+        f"""
+        SELECT airport,
+               SUM(CASE WHEN status = 'REGULER' THEN movements ELSE 0 END) AS REGULER,
+               SUM(CASE WHEN status <> 'REGULER' THEN movements ELSE 0 END) AS IRREGULER
+        FROM {ROLLUP_TABLE}
+        WHERE tanggal BETWEEN %s AND %s AND airport IN ({placeholders})
+        GROUP BY airport
+        """,
+        (start_date, end_date, *codes),
+        dates=[(start_date, end_date)],
+    )
+    result = df.set_index("airport").reindex(codes, fill_value=0).astype(int)
+    result["TOTAL"] = result["REGULER"] + result["IRREGULER"]
+    return result
+
+
+if __name__ == "__main__":
+    # Perintah bangun ulang: python rollup.py rebuild
+    if sys.argv[1:] != ["rebuild"]:
+        print("Penggunaan: python rollup.py rebuild")
+        sys.exit(2)
+    with connection() as conn:
+        rebuild(conn)
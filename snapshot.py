@@ -0,0 +1,257 @@
+import os
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from db import connection, run_query
+from export import ParquetWriter
+from instrumentation import record_query
+
+try:
+    import pyarrow.dataset as ds
+except ImportError:  # snapshot opsional, halaman tetap membaca MySQL
+    ds = None
+
+# Snapshot Parquet lokal untuk tanggal yang sudah lewat, dipartisi year=/month=/day=
+# Setiap hari yang sudah diekspor selalu punya satu file (boleh kosong), sehingga partisi yang tidak ada
+# berarti hari tersebut belum diekspor dan dibaca dari MySQL. Hari ini dan seterusnya selalu dari MySQL.
+# Sumber snapshot (sub_flight_db) tidak ditulis oleh halaman upload; setelah data hari yang sudah lewat diubah
+# di sumber, ekspor ulang dengan: python snapshot.py export YYYY-MM-DD YYYY-MM-DD --force
+DEFAULT_SNAPSHOT_PATH = "snapshot"
+
+# Kolom dimensi (negara bandara, nama maskapai) ikut disimpan agar halaman tidak perlu join
+SNAPSHOT_TABLES = {
+    "flights": {
+        "source": "sub_flight_db.flights",
+        "date_column": "tanggal_dummy",
+        "dimensions": {
+            "DEP_COUNTRY": "dep_airports.COUNTRY",
+            "ARR_COUNTRY": "arr_airports.COUNTRY",
+            "AIRLINE_NAME": "airlines.AIRLINE_NAME",
+        },
+        "query": """
+            SELECT {columns}
+            FROM {source}
+            LEFT JOIN sub_flight_db.airports AS dep_airports ON flights.ADEP = dep_airports.ICAO_CODE
+            LEFT JOIN sub_flight_db.airports AS arr_airports ON flights.ADES = arr_airports.ICAO_CODE
+            LEFT JOIN sub_flight_db.airlines ON flights.ICAO_CODE = airlines.ICAO_CODE
+            WHERE {where}
+        """,
+    },
+    "pprp": {
+        "source": "sub_flight_db_2.pprp",
+        "date_column": "TANGGAL",
+        "dimensions": {"AIRLINE_NAME": "a.AIRLINE_NAME"},
+        "query": """
+            SELECT {columns}
+            FROM {source}
+            LEFT JOIN (
+                SELECT ICAO_CODE, MIN(AIRLINE_NAME) AS AIRLINE_NAME
+                FROM sub_flight_db_2.airlines
+                GROUP BY ICAO_CODE
+            ) a ON pprp.ICAO_AIRLINE = a.ICAO_CODE
+            WHERE {where}
+        """,
+    },
+}
+
+# Tabel dimensi disalin utuh (satu file per tabel) untuk backend analitik yang menjalankan join sendiri
+DIMENSION_TABLES = ["sub_flight_db.airports", "sub_flight_db.airlines", "sub_flight_db_2.airlines"]
+
+
+def snapshot_enabled():
+    return ds is not None and st.secrets.get("snapshot", {}).get("enabled", False)
+
+
+def snapshot_root():
+    return Path(st.secrets.get("snapshot", {}).get("path", DEFAULT_SNAPSHOT_PATH))
+
+
+def partition_dir(table, day):
+    return snapshot_root() / table / f"year={day.year}" / f"month={day.month:02}" / f"day={day.day:02}"
+
+
+def partition_file(table, day):
+    return partition_dir(table, day) / "part-0.parquet"
+
+
+def dimension_file(source):
+    return snapshot_root() / "dimensions" / f"{source}.parquet"
+
+
+def _days(start_date, end_date):
+    return list(pd.date_range(start_date, end_date).date)
+
+
+# Query sumber (dengan dimensi) untuk rentang tanggal; dipakai ekspor dan fallback MySQL
+# `columns` None berarti semua kolom tabel ditambah semua kolom dimensi
+def source_query(table, start_date, end_date, columns=None):
+    spec = SNAPSHOT_TABLES[table]
+    if columns is None:
+        select = [f"{table}.*"] + [f"{expr} AS {name}" for name, expr in spec["dimensions"].items()]
+    else:
+        select = [
+            f"{spec['dimensions'][name]} AS {name}" if name in spec["dimensions"] else f"{table}.`{name}`"
+            for name in columns
+        ]
+    date_column = f"{table}.{spec['date_column']}"
+    query = spec["query"].format(
+        columns=", ".join(select), source=spec["source"], where=f"{date_column} BETWEEN %s AND %s"
+    )
+    return query, (start_date, end_date)
+
+
+# Tulis hasil query ke satu file Parquet; file ditulis sementara lalu diganti atomik
+# Skema Arrow diambil dari cursor.description sehingga hari kosong atau kolom yang seluruhnya NULL
+# tetap bertipe sama dengan hari lain
+def _write_parquet(conn, query, params, target):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temporary = target.with_suffix(".tmp")
+    with conn.cursor() as cursor:
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        writer = ParquetWriter(str(temporary), cursor.description)
+        try:
+            if rows:
+                writer.write(rows)
+        finally:
+            writer.close()
+    os.replace(temporary, target)
+    return len(rows)
+
+
+# Tulis satu partisi hari
+def export_day(conn, table, day):
+    query, params = source_query(table, day, day)
+    return _write_parquet(conn, query, params, partition_file(table, day))
+
+
+# Salin ulang satu tabel dimensi
+def export_dimension(conn, source):
+    return _write_parquet(conn, f"SELECT * FROM {source}", None, dimension_file(source))
+
+
+# Ekspor hari-hari yang sudah lewat dalam rentang; partisi yang sudah ada dilewati kecuali force=True
+def export_range(conn, table, start_date, end_date, force=False, log=print):
+    last_closed = date.today() - timedelta(days=1)
+    for day in _days(start_date, min(end_date, last_closed)):
+        if not force and partition_file(table, day).exists():
+            continue
+        rows = export_day(conn, table, day)
+        log(f"Snapshot {table} {day}: {rows} baris")
+
+
+# Gabungkan hari-hari terurut menjadi rentang (awal, akhir) yang berurutan
+def day_ranges(days):
+    ranges = []
+    for day in days:
+        if ranges and ranges[-1][1] == day - timedelta(days=1):
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
+
+
+# Bagi rentang menjadi hari yang bisa dibaca dari snapshot dan rentang sisa yang dibaca dari MySQL
+def split_range(table, start_date, end_date):
+    enabled = snapshot_enabled()
+    last_closed = date.today() - timedelta(days=1)
+    snapshot_days, mysql_days = [], []
+    for day in _days(start_date, end_date):
+        if enabled and day <= last_closed and partition_file(table, day).exists():
+            snapshot_days.append(day)
+        else:
+            mysql_days.append(day)
+    return snapshot_days, day_ranges(mysql_days)
+
+
+# Baca partisi hari dari snapshot dengan pushdown kolom dan filter (ekspresi pyarrow.dataset)
+def read_snapshot(table, days, columns=None, filter=None):
+    started = time.perf_counter()
+    files = [str(partition_file(table, day)) for day in days]
+    dataset = ds.dataset(files, format="parquet")
+    df = dataset.to_table(columns=columns, filter=filter).to_pandas()
+    record_query(f"snapshot {table} ({len(days)} hari)", time.perf_counter() - started, df, "snapshot")
+    return df
+
+
+# Filter kesamaan satu kolom untuk snapshot (None tanpa pyarrow; snapshot memang tidak dibaca)
+def equals_filter(column, value):
+    return None if ds is None else ds.field(column) == value
+
+
+# Filter bandara untuk snapshot: ADEP = airport atau ADES = airport
+def airport_filter(airport):
+    if ds is None:
+        return None
+    return (ds.field("ADEP") == airport) | (ds.field("ADES") == airport)
+
+
+# Klausa MySQL untuk satu bandara (pasangan airport_filter di snapshot): (where, params)
+def airport_where(airport):
+    return "flights.ADEP = %s OR flights.ADES = %s", (airport, airport)
+
+
+# Query MySQL untuk rentang yang belum ada di snapshot: source_query dengan klausa tambahan `where` + `params`
+def mysql_query(table, start_date, end_date, columns, where=None, params=()):
+    query, query_params = source_query(table, start_date, end_date, columns=columns)
+    if where:
+        query += f" AND ({where})"
+        query_params += tuple(params)
+    return query, query_params
+
+
+# Baris `table` (dengan kolom dimensi) untuk rentang tanggal; hari yang sudah ada di snapshot dibaca dari
+# Parquet dengan `snapshot_filter`, sisanya dari MySQL dengan klausa tambahan `where` + `params`
+def load_table(table, start_date, end_date, columns, snapshot_filter=None, where=None, params=()):
+    snapshot_days, mysql_ranges = split_range(table, start_date, end_date)
+    frames = []
+    if snapshot_days:
+        frames.append(read_snapshot(table, snapshot_days, columns=columns, filter=snapshot_filter))
+    for start, end in mysql_ranges:
+        query, query_params = mysql_query(table, start, end, columns, where=where, params=params)
+        frames.append(run_query(query, query_params, dates=[(start, end)]))
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+
+# Baris flights (dengan DEP_COUNTRY, ARR_COUNTRY, AIRLINE_NAME) untuk rentang tanggal, opsional satu bandara
+def load_flights(start_date, end_date, columns, airport=None):
+    if airport is None:
+        return load_table("flights", start_date, end_date, columns)
+    where, params = airport_where(airport)
+    return load_table(
+        "flights", start_date, end_date, columns,
+        snapshot_filter=airport_filter(airport), where=where, params=params,
+    )
+
+
+if __name__ == "__main__":
+    # Perintah: python snapshot.py export [YYYY-MM-DD YYYY-MM-DD] [--force]
+    args = [arg for arg in sys.argv[1:] if arg != "--force"]
+    if not args or args[0] != "export" or len(args) not in (1, 3):
+        print("Penggunaan: python snapshot.py export [YYYY-MM-DD YYYY-MM-DD] [--force]")
+        sys.exit(2)
+    if ds is None:
+        print("Snapshot membutuhkan paket pyarrow.")
+        sys.exit(2)
+    force = "--force" in sys.argv
+    with connection() as conn:
+        for source in DIMENSION_TABLES:
+            print(f"Snapshot {source}: {export_dimension(conn, source)} baris")
+        for table, spec in SNAPSHOT_TABLES.items():
+            if len(args) == 3:
+                start, end = date.fromisoformat(args[1]), date.fromisoformat(args[2])
+            else:
+                bounds = pd.read_sql(
+                    f"SELECT MIN({spec['date_column']}) AS first, MAX({spec['date_column']}) AS last "
+                    f"FROM {spec['source']}",
+                    conn,
+                ).iloc[0]
+                if pd.isna(bounds["first"]):
+                    continue
+                start, end = pd.Timestamp(bounds["first"]).date(), pd.Timestamp(bounds["last"]).date()
+            export_range(conn, table, start, end, force=force)
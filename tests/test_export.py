@@ -0,0 +1,65 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+import export
+
+
+class _FakeCursor:
+    description = [("tanggal_dummy",), ("id",), ("ADEP",)]
+
+    def __init__(self, rows, fail=False):
+        self._rows = list(rows)
+        self._fail = fail
+
+    def execute(self, query, params):
+        pass
+
+    def fetchmany(self, size):
+        if self._fail:
+            raise RuntimeError("koneksi terputus")
+        chunk, self._rows = self._rows[:size], self._rows[size:]
+        return chunk
+
+    def close(self):
+        pass
+
+
+def _fake_connection(cursor):
+    @contextmanager
+    def connection():
+        class _Conn:
+            def cursor(self, cursor_class=None):
+                return cursor
+        yield _Conn()
+    return connection
+
+
+@pytest.fixture
+def temp_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(export, "select_list", lambda columns: ", ".join(columns))
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    return tmp_path
+
+
+# File ekspor dibaca ke bytes dan direktori sementaranya tidak tertinggal
+def test_export_returns_bytes_and_removes_temp_file(monkeypatch, temp_dir):
+    rows = [("2024-01-01", i, "WIII") for i in range(5)]
+    monkeypatch.setattr(export, "connection", _fake_connection(_FakeCursor(rows)))
+
+    data, total = export.export_flights("2024-01-01", "2024-01-02", ["ADEP"], chunk_size=2)
+
+    assert total == 5
+    assert data.decode("utf-8").splitlines() == ["tanggal_dummy,id,ADEP"] + [f"2024-01-01,{i},WIII" for i in range(5)]
+    assert os.listdir(temp_dir) == []
+
+
+# Direktori sementara juga dihapus saat ekspor gagal di tengah jalan
+def test_export_removes_temp_file_on_error(monkeypatch, temp_dir):
+    monkeypatch.setattr(export, "connection", _fake_connection(_FakeCursor([], fail=True)))
+
+    with pytest.raises(RuntimeError):
+        export.export_flights("2024-01-01", "2024-01-02", ["ADEP"])
+    assert os.listdir(temp_dir) == []
@@ -0,0 +1,59 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ingest
+from benchmarks.bench_clean_data import legacy_clean_rows, make_synthetic
+
+
+# Baris hasil clean_data sama dengan clean_data + itertuples lama, juga saat data terbagi beberapa chunk
+@pytest.mark.parametrize("n_rows, chunk_rows", [(0, 300), (1, 300), (1_000, 300), (5_000, ingest.CLEAN_CHUNK_ROWS)])
+def test_clean_data_matches_legacy(monkeypatch, n_rows, chunk_rows):
+    monkeypatch.setattr(ingest, "CLEAN_CHUNK_ROWS", chunk_rows)
+    data = make_synthetic(n_rows, seed=1)
+    assert ingest.clean_data(data.copy()) == legacy_clean_rows(data.copy())
+
+
+# POB di atas batas int16 tidak berputar menjadi negatif
+def test_pob_keeps_large_values():
+    converted = ingest._to_int(pd.Series([40000, 12.6, None, "x"])).tolist()
+    assert converted == [40000, 13, None, None]
+    assert type(converted[0]) is int
+
+
+# Kode float bulat (737.0 -> "737") diputuskan per kolom, bukan per chunk
+def test_integral_codes_decided_per_column(monkeypatch):
+    monkeypatch.setattr(ingest, "CLEAN_CHUNK_ROWS", 2)
+    data = make_synthetic(4, seed=1)
+    data["A_TYPE"] = np.array([737.0, 737.0, 737.0, 320.5])
+    column = list(data.columns).index("A_TYPE")
+    assert [row[column] for row in ingest.clean_data(data)] == ["737.0", "737.0", "737.0", "320.5"]
+
+
+class _BrokenExecutor:
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_exception(BrokenProcessPool("worker mati"))
+        return future
+
+
+# Worker yang mati tidak membuat upload gagal: file dibaca ulang dengan mode stream dan ditandai pool_broken
+def test_broken_pool_falls_back_to_streaming(monkeypatch):
+    streamed = []
+
+    def fake_streaming(files, write, on_event, chunk_size):
+        files = list(files)
+        streamed.extend(key for key, _ in files)
+        return {key: {"status": "done", "rows": len(content)} for key, content in files}
+
+    monkeypatch.setattr(ingest, "_run_streaming", fake_streaming)
+    results = ingest.run_pipeline([("CGK", b"ab"), ("DPS", b"abc")], write=None, executor=_BrokenExecutor())
+
+    assert sorted(streamed) == ["CGK", "DPS"]
+    assert results == {
+        "CGK": {"status": "done", "rows": 2, "pool_broken": True},
+        "DPS": {"status": "done", "rows": 3, "pool_broken": True},
+    }
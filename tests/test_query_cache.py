@@ -0,0 +1,55 @@
+from datetime import date
+
+import pandas as pd
+
+from query_cache import QueryCache
+
+FRAME = pd.DataFrame({"total": [1]})
+
+
+def cache_with(key, dates):
+    cache = QueryCache()
+    cache.put(key, FRAME, cache.current_version(), dates)
+    return cache
+
+
+# Entri basi hanya jika salah satu tanggalnya di-bump setelah entri disimpan
+def test_bump_invalidates_only_entries_reading_the_date():
+    cache = QueryCache()
+    cache.put("januari", FRAME, cache.current_version(), [(date(2025, 1, 1), date(2025, 1, 31))])
+    cache.put("februari", FRAME, cache.current_version(), [date(2025, 2, 1)])
+    cache.bump([date(2025, 1, 15)])
+    assert cache.get("januari") is None
+    assert cache.get("februari") is not None
+
+
+# Entri dengan rentang panjang (lebih banyak hari dari versi tanggal) dan pendek memakai jalur yang sama hasilnya
+def test_long_and_short_ranges_agree():
+    long_range = cache_with("musim", [(date(2024, 10, 27), date(2025, 3, 28))])
+    short_range = cache_with("hari", [date(2025, 1, 15)])
+    for cache in (long_range, short_range):
+        cache.bump([date(2025, 1, 15)])
+    assert long_range.get("musim") is None
+    assert short_range.get("hari") is None
+
+
+# Versi tanggal tidak menumpuk: yang tidak lebih baru dari entri tertua dibuang setiap bump
+def test_date_versions_are_pruned():
+    cache = QueryCache()
+    for day in range(1, 29):
+        cache.bump([date(2025, 2, day)])
+    assert len(cache._date_versions) == 0
+    cache.put("maret", FRAME, cache.current_version(), [date(2025, 3, 1)])
+    cache.bump([date(2025, 3, 1)])
+    assert len(cache._date_versions) == 1
+    assert cache.get("maret") is None
+
+
+# Query yang mulai sebelum bump tidak disimpan jika versi tanggal yang bisa membuatnya basi sudah dibuang
+def test_put_older_than_pruned_versions_is_skipped():
+    cache = QueryCache()
+    started_at = cache.current_version()
+    cache.bump([date(2025, 1, 1)])
+    cache.bump([date(2025, 1, 2)])
+    cache.put("januari", FRAME, started_at, [date(2025, 1, 1)])
+    assert cache.get("januari") is None
@@ -0,0 +1,58 @@
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_time_conversion import (
+    legacy_convert_to_time, legacy_hhmm_column, make_clock_text, make_mixed, make_synthetic,
+)
+from time_utils import to_hhmm, to_timedelta, to_timestamps
+
+REFERENCE_TIME = datetime(2025, 1, 1)
+
+
+def legacy_timestamps(values):
+    return pd.to_datetime(values.apply(lambda x: legacy_convert_to_time(REFERENCE_TIME, x)))
+
+
+# Kolom timedelta, teks, kosong dan campuran sama dengan convert_to_time lama di Data Realisasi
+@pytest.mark.parametrize("values", [
+    make_synthetic(2_000, seed=1),
+    make_mixed(2_000, seed=2),
+    pd.Series(["5 minutes", " 2 hours", "1 day", "-3 minutes", "abc", "", "5 Minutes", None], dtype=object),
+    pd.Series([None, np.nan, None], dtype=object),
+    pd.Series(["5 minutes", pd.Timedelta(minutes=3), 7, 1.5, None, np.nan], dtype=object),
+], ids=["timedelta", "campuran", "teks", "kosong", "angka di kolom campuran"])
+def test_to_timestamps_matches_legacy(values):
+    expected = legacy_timestamps(values)
+    actual = to_timestamps(REFERENCE_TIME, values)
+    pd.testing.assert_series_equal(actual, expected, check_names=False)
+
+
+# ETD/ETA sama dengan pd.to_timedelta + convert_to_time lama di Data Planning
+@pytest.mark.parametrize("values", [
+    make_synthetic(2_000, seed=1),
+    make_clock_text(2_000, seed=2),
+    pd.Series(["01:30:00", "25:05:00", "5 minutes", None, np.nan], dtype=object),
+    pd.Series([pd.Timedelta(minutes=90), None, pd.Timedelta(seconds=-90)], dtype=object),
+], ids=["timedelta", "teks HH:MM:SS", "teks campuran", "Timedelta dan None"])
+def test_to_hhmm_matches_legacy(values):
+    expected = legacy_hhmm_column(values)
+    actual = to_hhmm(values)
+    assert actual.tolist() == expected.tolist()
+
+
+# Lama: pd.to_timedelta tanpa errors="coerce" membuat halaman error; sekarang None
+def test_to_hhmm_unparseable_text_is_none():
+    assert to_hhmm(pd.Series(["abc", "01:30:00"])).tolist() == [None, "01:30"]
+
+
+# Detik kosong tidak ikut dikonversi, sehingga tidak ada RuntimeWarning saat cast NaN
+def test_to_timedelta_without_runtime_warning():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        result = to_timedelta(pd.Series(["5 minutes", None, "abc", ""]))
+    assert result.tolist()[0] == pd.Timedelta(minutes=5)
+    assert result.iloc[1:].isna().all()
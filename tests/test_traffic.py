@@ -0,0 +1,22 @@
+import pytest
+
+from benchmarks.bench_airport_movements import legacy_counts, new_counts
+from benchmarks.bench_airport_movements import make_synthetic as make_airport_flights
+from benchmarks.bench_classify_movements import legacy_classify, new_classify
+from benchmarks.bench_classify_movements import make_synthetic as make_realisasi_flights
+
+
+# Hitung movement Infografis harian sama dengan loop iterrows lama, termasuk data kosong dan satu baris
+@pytest.mark.parametrize("n_rows, seed", [(0, 0), (1, 0), (500, 1), (20_000, 2)])
+def test_airport_movement_counts_matches_legacy(n_rows, seed):
+    flights = make_airport_flights(n_rows, seed=seed)
+    assert new_counts(flights) == legacy_counts(flights)
+
+
+@pytest.mark.parametrize("n_rows, seed", [(0, 0), (1, 0), (500, 1), (20_000, 2)])
+def test_classify_movements_matches_legacy(n_rows, seed):
+    flights = make_realisasi_flights(n_rows, seed=seed)
+    expected, actual = legacy_classify(flights), new_classify(flights)
+    assert actual == expected
+    # Urutan maskapai di keterangan ikut ditampilkan, jadi harus sama dengan urutan kemunculan lama
+    assert list(actual[1]) == list(expected[1])
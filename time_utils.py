@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+# Satuan yang dikenali pada bentuk teks seperti "5 minutes", "2 hours", "1 day" (dicek berurutan)
+_TEXT_UNITS = [("minute", 60), ("hour", 3600), ("day", 86400)]
+
+
+# Ubah kolom TIME MySQL (timedelta) atau teks "N minutes/hours/days" menjadi timedelta64 secara vektor
+# Nilai kosong, teks yang tidak dikenali, dan tipe lain (mis. angka) menjadi NaT
+def to_timedelta(values):
+    values = pd.Series(values)
+    if pd.api.types.is_timedelta64_dtype(values):
+        return values
+
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+    if kind in ("timedelta", "empty"):
+        return pd.to_timedelta(values, errors="coerce")
+    result = pd.Series(pd.NaT, index=values.index, dtype="timedelta64[ns]")
+    if kind not in ("string", "mixed", "mixed-integer"):
+        return result
+
+    # Bagian teks: angka di depan dikali satuan pertama yang ditemukan
+    # Teks diparse sekali per nilai unik (jumlahnya kecil, mis. "5 minutes"), lalu disebar lewat kode factorize
+    is_text = np.fromiter((isinstance(value, str) for value in values), dtype=bool, count=len(values))
+    if is_text.any():
+        codes, uniques = pd.factorize(values[is_text])
+        uniques = pd.Series(uniques, dtype=object)
+        amount = pd.to_numeric(uniques.str.extract(r"^\s*(-?\d+)", expand=False), errors="coerce").to_numpy()
+        conditions = [uniques.str.contains(unit, regex=False).to_numpy(dtype=bool) for unit, _ in _TEXT_UNITS]
+        unique_seconds = amount * np.select(conditions, [factor for _, factor in _TEXT_UNITS], default=np.nan)
+        seconds = np.full(len(values), np.nan)
+        seconds[is_text] = unique_seconds[codes]
+        # Hanya detik yang terisi dikonversi: NaN pada to_timedelta(unit="s") memicu RuntimeWarning saat cast
+        known = ~np.isnan(seconds)
+        result[known] = pd.to_timedelta(seconds[known], unit="s")
+
+    # Bagian durasi di kolom campuran (mis. Timedelta di antara teks); angka dan tipe lain tetap NaT
+    is_duration = np.fromiter(
+        (isinstance(value, (timedelta, np.timedelta64)) for value in values), dtype=bool, count=len(values)
+    )
+    if is_duration.any():
+        result[is_duration] = pd.to_timedelta(values[is_duration].to_numpy())
+    return result
+
+
+# Fungsi untuk konversi waktu: reference_time + durasi, hasilnya kolom datetime64 (NaT untuk nilai kosong)
+def to_timestamps(reference_time, values):
+    return pd.Timestamp(reference_time) + to_timedelta(values)
+
+
+# Fungsi untuk mengonversi waktu menjadi HH:MM (jam bisa lebih dari 23 untuk TIME > 24 jam), None jika kosong
+# Teks diparse oleh pd.to_timedelta ("HH:MM:SS", "5 minutes") seperti Data Planning lama; nilai yang tidak
+# bisa diparse menjadi None (sebelumnya membuat halaman error)
+def to_hhmm(values):
+    seconds = pd.to_timedelta(pd.Series(values), errors="coerce").dt.total_seconds()
+    missing = seconds.isna()
+    seconds = seconds.fillna(0)
+    hours = (seconds // 3600).astype(int).astype(str).str.zfill(2)
+    minutes = ((seconds % 3600) // 60).astype(int).astype(str).str.zfill(2)
+    return (hours + ":" + minutes).mask(missing, None)
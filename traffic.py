@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+
+
+# Hitung movement REGULER/IRREGULER/TOTAL per bandara
+# Setiap penerbangan dihitung sekali untuk ADEP dan sekali untuk ADES jika bandaranya ada di `airports`,
+# dan dihitung dua kali jika DEP_ARR_LOCAL = 'L' (sama dengan perhitungan per baris sebelumnya)
+def airport_movement_counts(df, airports):
+    codes = list(airports)
+    weight = np.where(df["DEP_ARR_LOCAL"].to_numpy() == "L", 2, 1)
+    reguler = (df["STATUS_FLIGHT"] == "REGULER").to_numpy()
+
+    # melt ADEP/ADES menjadi satu kolom lokasi
+    locations = pd.DataFrame({
+        "LOKASI": np.concatenate([df["ADEP"].to_numpy(), df["ADES"].to_numpy()]),
+        "REGULER": np.tile(reguler, 2),
+        "WEIGHT": np.tile(weight, 2),
+    })
+    locations = locations[locations["LOKASI"].isin(codes)]
+
+    counts = (
+        locations.groupby(["LOKASI", "REGULER"])["WEIGHT"].sum()
+        .unstack(fill_value=0)
+        .reindex(index=codes, columns=[True, False], fill_value=0)
+    )
+    result = pd.DataFrame({
+        "REGULER": counts[True].astype(int),
+        "IRREGULER": counts[False].astype(int),
+    }, index=codes)
+    result["TOTAL"] = result["REGULER"] + result["IRREGULER"]
+    return result
+
+
+# Status penerbangan tidak berjadwal, urutan sesuai tabel KETERANGAN
+UNSCHEDULE_STATUSES = ["POSITIONING", "CARGO", "CHARTER", "EXTRA", "VIP"]
+MOVEMENT_TYPES = ["SCHEDULE", "UNSCHEDULE", "MILITARY"]
+DIRECTIONS = ["DOM_DEP", "DOM_ARR", "INT_DEP", "INT_ARR"]
+# Kolom flights yang dibaca halaman Data Realisasi (termasuk kolom dimensi dari snapshot.load_flights)
+FLIGHT_COLUMNS = [
+    "tanggal_dummy", "ADEP", "ADES", "STATUS_FLIGHT", "ACID", "DEP_ARR_LOCAL", "ATD", "ATA",
+    "DEP_COUNTRY", "ARR_COUNTRY", "AIRLINE_NAME",
+]
+
+
+# Klasifikasi traffic SCHEDULE/UNSCHEDULE/MILITARY x DOM/INT x DEP/ARR untuk satu bandara
+# Mengembalikan (matrix, schedule_keterangan, unschedule_keterangan):
+# - matrix: DataFrame index MOVEMENT_TYPES, kolom DIRECTIONS
+# - schedule_keterangan: {AIRLINE_NAME: movement} untuk REGULER, urut kemunculan pertama
+# - unschedule_keterangan: {status: movement} untuk UNSCHEDULE_STATUSES
+# Movement lokal (ADEP = ADES = bandara) dihitung sebagai DOM_DEP dan DOM_ARR, dan dihitung dua kali
+# di keterangan jika DEP_ARR_LOCAL = 'L'.
+def classify_movements(data, airport="WARR"):
+    status = data["STATUS_FLIGHT"]
+    movement_type = np.select(
+        [(status == "REGULER").to_numpy(), status.isin(UNSCHEDULE_STATUSES).to_numpy()],
+        ["SCHEDULE", "UNSCHEDULE"],
+        default="MILITARY",
+    )
+
+    is_dep = data["ADEP"] == airport
+    is_arr = data["ADES"] == airport
+    local = is_dep & is_arr
+    arr_country = data["ARR_COUNTRY"].str.strip()
+    dep_country = data["DEP_COUNTRY"].str.strip()
+
+    directions = pd.DataFrame({
+        "DOM_DEP": local | (is_dep & (arr_country == "Domestik")),
+        "DOM_ARR": local | (is_arr & (dep_country == "Domestik")),
+        "INT_DEP": ~local & is_dep & (arr_country == "International"),
+        "INT_ARR": ~local & is_arr & (dep_country == "International"),
+    }).astype(int)
+    matrix = (
+        directions.groupby(movement_type).sum()
+        .reindex(index=MOVEMENT_TYPES, columns=DIRECTIONS, fill_value=0)
+    )
+
+    weight = pd.Series(np.where(data["DEP_ARR_LOCAL"].to_numpy() == "L", 2, 1), index=data.index)
+    schedule = movement_type == "SCHEDULE"
+    schedule_counts = weight[schedule].groupby(data["AIRLINE_NAME"][schedule], sort=False, dropna=False).sum()
+    # Maskapai tanpa nama tetap ditampilkan sebagai None seperti sebelumnya
+    schedule_keterangan = {
+        (None if pd.isna(airline) else airline): count for airline, count in schedule_counts.items()
+    }
+    unschedule = movement_type == "UNSCHEDULE"
+    unschedule_keterangan = (
+        weight[unschedule].groupby(status[unschedule]).sum()
+        .reindex(UNSCHEDULE_STATUSES, fill_value=0).to_dict()
+    )
+    return matrix, schedule_keterangan, unschedule_keterangan
+
+
+# Label bin waktu, mis. "05:00-05:59" untuk bin 60 menit atau "05:15-05:29" untuk bin 15 menit
+def time_bin_labels(bin_minutes=60):
+    labels = []
+    for start in range(0, 24 * 60, bin_minutes):
+        end = start + bin_minutes - 1
+        labels.append(f"{start // 60:02}:{start % 60:02}-{end // 60:02}:{end % 60:02}")
+    return labels
+
+
+# Menit dalam hari (0-1439) dari kolom timestamp; NaN untuk nilai kosong
+def _minute_of_day(values):
+    values = pd.to_datetime(values, errors="coerce")
+    return (values.dt.hour * 60 + values.dt.minute).to_numpy(dtype=float)
+
+
+# Tabel Arrival/Departure/Movement per bin waktu untuk satu bandara
+# Data boleh berisi banyak hari; setiap movement dimasukkan ke bin berdasarkan jam ATA (arrival)
+# atau ATD (departure), lalu dijumlahkan lintas hari dengan np.bincount.
+# Movement lokal (DEP_ARR_LOCAL = 'L', ADEP = ADES = bandara) dihitung sebagai arrival dan departure.
+def hourly_summary(data, airport="WARR", bin_minutes=60, atd_column="ATD_converted", ata_column="ATA_converted"):
+    if (24 * 60) % bin_minutes:
+        raise ValueError(f"Lebar bin {bin_minutes} menit harus membagi habis 24 jam.")
+    n_bins = (24 * 60) // bin_minutes
+
+    atd_minutes = _minute_of_day(data[atd_column])
+    ata_minutes = _minute_of_day(data[ata_column])
+    dep_arr_local = data["DEP_ARR_LOCAL"].to_numpy()
+    countries = ["Domestik", "International"]
+
+    local = (dep_arr_local == "L") & (data["ADEP"] == airport).to_numpy() & (data["ADES"] == airport).to_numpy()
+    arrival = ~np.isnan(ata_minutes) & (
+        local | ((dep_arr_local == "A") & data["ARR_COUNTRY"].isin(countries).to_numpy())
+    )
+    departure = ~np.isnan(atd_minutes) & (
+        local | ((dep_arr_local == "D") & data["DEP_COUNTRY"].isin(countries).to_numpy())
+    )
+
+    arrival_counts = np.bincount((ata_minutes[arrival] // bin_minutes).astype(int), minlength=n_bins)
+    departure_counts = np.bincount((atd_minutes[departure] // bin_minutes).astype(int), minlength=n_bins)
+    return pd.DataFrame({
+        "Hour": time_bin_labels(bin_minutes),
+        "Arrival": arrival_counts,
+        "Departure": departure_counts,
+        "Movement": arrival_counts + departure_counts,
+    })
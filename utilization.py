@@ -0,0 +1,149 @@
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from queries import run_named
+from query_cache import data_version
+
+# Interval (detik) pemeriksaan sidik pprp sebelum index hierarki dipakai ulang
+HIERARCHY_CHECK_INTERVAL = 60
+
+
+# Sidik murah untuk mendeteksi perubahan pprp (jumlah baris dan tanggal terakhir)
+def pprp_fingerprint():
+    row = run_named("utilization.pprp_fingerprint", cache=False).iloc[0]
+    return int(row["total"]), str(row["last_date"])
+
+
+# Index {ICAO_AIRLINE: {FLIGHT_NUMBER: [RUTE, ...]}} dari hasil query utilization.hierarchy, urutan mengikuti query
+def build_hierarchy(rows):
+    hierarchy = {}
+    for airline, flight_number, rute in zip(
+        rows["ICAO_AIRLINE"].tolist(), rows["FLIGHT_NUMBER"].tolist(), rows["RUTE"].tolist()
+    ):
+        hierarchy.setdefault(airline, {}).setdefault(flight_number, []).append(rute)
+    return hierarchy
+
+
+# Penyimpan index bersama semua sesi
+@st.cache_resource
+def _hierarchy_holder():
+    return {"lock": threading.Lock(), "fingerprint": None, "checked_at": None, "hierarchy": None}
+
+
+# Index hierarki maskapai -> nomor penerbangan -> rute untuk dropdown Flight Utilization
+# Dibangun ulang hanya jika sidik pprp berubah; sidik diperiksa paling sering sekali per interval
+def flight_hierarchy():
+    holder = _hierarchy_holder()
+    with holder["lock"]:
+        now = time.monotonic()
+        if holder["checked_at"] is None or now - holder["checked_at"] > HIERARCHY_CHECK_INTERVAL:
+            fingerprint = pprp_fingerprint()
+            if fingerprint != holder["fingerprint"] or holder["hierarchy"] is None:
+                holder["hierarchy"] = build_hierarchy(run_named("utilization.hierarchy", cache=False))
+                holder["fingerprint"] = fingerprint
+            holder["checked_at"] = now
+        return holder["hierarchy"]
+
+
+# Musim penerbangan default (winter season 2024/2025)
+SEASON_START = date(2024, 10, 27)
+SEASON_END = date(2025, 3, 28)
+
+# Callsign ACID: kode maskapai ICAO 3 huruf + nomor penerbangan (+ sufiks huruf opsional), mis. GIA318 / LNI702A
+ACID_PATTERN = r"^\s*([A-Z]{3})(\d+)[A-Z]?\s*$"
+
+
+# Izin per (maskapai, nomor penerbangan, rute, bandara asal, bandara tujuan) dalam musim dari pprp
+# Agregasi musim bisa berjalan di backend analitik (DuckDB) jika seluruh musim sudah ada di snapshot
+def fetch_permitted(start_date, end_date):
+    return run_named(
+        "utilization.permitted",
+        {"start_date": start_date, "end_date": end_date},
+        dates=[(start_date, end_date)],
+        page="Flight Utilization",
+    )
+
+
+# Realisasi per (ACID, ICAO_CODE maskapai, ADEP, ADES) dalam musim dari flights
+def fetch_realised(start_date, end_date):
+    return run_named(
+        "utilization.realised",
+        {"start_date": start_date, "end_date": end_date},
+        dates=[(start_date, end_date)],
+    )
+
+
+# Pecah ACID menjadi kode maskapai dan nomor penerbangan; ACID yang tidak cocok memakai ICAO_CODE
+# dan nomor penerbangan kosong sehingga tidak terhitung
+def parse_acid(realised):
+    parts = realised["ACID"].astype("string").str.upper().str.extract(ACID_PATTERN)
+    airline = parts[0].fillna(realised["ICAO_CODE"].astype("string"))
+    flight_number = pd.to_numeric(parts[1], errors="coerce").astype("Int64")
+    return airline, flight_number
+
+
+# Tabel utilisasi semua (maskapai, nomor penerbangan, rute) dari hasil fetch_permitted dan fetch_realised
+# Penerbangan terealisasi dicocokkan ke izin lewat hash join pada maskapai, nomor penerbangan, ADEP/ADES
+def utilization_table(permitted, realised):
+    airline, flight_number = parse_acid(realised)
+    realised = (
+        pd.DataFrame({
+            "ICAO_AIRLINE": airline,
+            "FLIGHT_NUMBER": flight_number,
+            "DEP_ICAO": realised["ADEP"].astype("string"),
+            "ARR_ICAO": realised["ADES"].astype("string"),
+            "realised": realised["realised"].astype("int64"),
+        })
+        .dropna(subset=["ICAO_AIRLINE", "FLIGHT_NUMBER"])
+        .groupby(["ICAO_AIRLINE", "FLIGHT_NUMBER", "DEP_ICAO", "ARR_ICAO"], as_index=False)["realised"].sum()
+    )
+    # Hasil query kosong bertipe object; tanpa cast ke int kolom hitungan hilang saat groupby().sum()
+    permitted = permitted.assign(
+        permitted=permitted["permitted"].astype("int64"),
+        ICAO_AIRLINE=permitted["ICAO_AIRLINE"].astype("string"),
+        FLIGHT_NUMBER=pd.to_numeric(permitted["FLIGHT_NUMBER"], errors="coerce").astype("Int64"),
+        DEP_ICAO=permitted["DEP_ICAO"].astype("string"),
+        ARR_ICAO=permitted["ARR_ICAO"].astype("string"),
+    )
+
+    joined = permitted.merge(realised, how="left", on=["ICAO_AIRLINE", "FLIGHT_NUMBER", "DEP_ICAO", "ARR_ICAO"])
+    table = (
+        joined.assign(realised=joined["realised"].fillna(0).astype("int64"))
+        .groupby(["ICAO_AIRLINE", "FLIGHT_NUMBER", "RUTE"], as_index=False, dropna=False)[["permitted", "realised"]]
+        .sum()
+        .rename(columns={"permitted": "IZIN", "realised": "REALISASI"})
+    )
+    table["SISA"] = table["IZIN"] - table["REALISASI"]
+    table["PERSENTASE"] = (table["REALISASI"] / table["IZIN"].where(table["IZIN"] != 0) * 100).fillna(0).round(1)
+    return table.sort_values(
+        ["PERSENTASE", "IZIN"], ascending=[False, False], kind="stable"
+    ).reset_index(drop=True)
+
+
+# Tabel utilisasi satu musim, disimpan bersama semua sesi
+# `version` (versi upload dan sidik pprp) menjadi bagian kunci agar data baru langsung terhitung
+@st.cache_data(ttl=HIERARCHY_CHECK_INTERVAL * 5, max_entries=8, show_spinner=False)
+def _season_utilization(start_date, end_date, version):
+    return utilization_table(fetch_permitted(start_date, end_date), fetch_realised(start_date, end_date))
+
+
+def season_utilization(start_date=SEASON_START, end_date=SEASON_END):
+    version = (data_version(), _hierarchy_holder()["fingerprint"])
+    return _season_utilization(start_date, end_date, version)
+
+
+# Baris utilisasi untuk satu pilihan dropdown (dict IZIN/REALISASI/SISA/PERSENTASE), nol jika tidak ada izin
+def selection_utilization(table, airline, flight_number, rute):
+    match = table[
+        (table["ICAO_AIRLINE"] == airline)
+        & (table["FLIGHT_NUMBER"] == flight_number)
+        & (table["RUTE"] == rute)
+    ]
+    if match.empty:
+        return {"IZIN": 0, "REALISASI": 0, "SISA": 0, "PERSENTASE": 0.0}
+    row = match.iloc[0]
+    return {key: row[key] for key in ["IZIN", "REALISASI", "SISA", "PERSENTASE"]}
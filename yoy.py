@@ -0,0 +1,153 @@
+import calendar
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from analytics_backend import analytics_backend, run_analytics
+from db import run_query
+from snapshot import day_ranges, equals_filter, read_snapshot, split_range
+
+# Perbandingan movement harian antar tahun (year-over-year) untuk satu bulan atau rentang hari
+# Setiap tahun dipilih dengan predikat BETWEEN pada tanggal_dummy agar index tanggal tetap terpakai
+FLIGHTS_TABLE = "sub_flight_db.flights"
+# Nama halaman untuk pilihan backend analitik ([analytics.pages])
+PAGE = "Data Realisasi"
+
+
+def movement_column(year):
+    return f"total_movement_{year}"
+
+
+def growth_column(previous_year, year):
+    return f"Growth {previous_year}-{year}"
+
+
+# Geser tanggal ke tahun lain; 29 Februari menjadi 28 Februari pada tahun non-kabisat
+def _shift_year(value, year):
+    if value.month == 2 and value.day == 29 and not calendar.isleap(year):
+        return date(year, 2, 28)
+    return value.replace(year=year)
+
+
+# Rentang (tahun, awal, akhir) per tahun untuk satu bulan atau rentang hari `day_range` = (awal, akhir)
+# Tahun pada `day_range` menjadi acuan; rentang yang melewati akhir tahun ikut bergeser utuh
+def year_ranges(years, month=None, day_range=None):
+    if (month is None) == (day_range is None):
+        raise ValueError("Pilih salah satu: bulan atau rentang hari.")
+    ranges = []
+    for year in sorted(set(years)):
+        if month is not None:
+            ranges.append((year, date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])))
+        else:
+            start, end = day_range
+            ranges.append((year, _shift_year(start, year), _shift_year(end, year + end.year - start.year)))
+    return ranges
+
+
+# Query total movement per tanggal untuk `n_ranges` rentang tanggal (sama untuk MySQL dan DuckDB)
+def daily_movements_sql(n_ranges, table=FLIGHTS_TABLE):
+    predicates = " OR ".join(["tanggal_dummy BETWEEN %s AND %s"] * n_ranges)
+    return f"""
+        SELECT tanggal_dummy, SUM(CASE WHEN DEP_ARR_LOCAL = 'L' THEN 2 ELSE 1 END) AS total_movement
+        FROM {table}
+        WHERE STATUS_FLIGHT = %s AND ({predicates})
+        GROUP BY tanggal_dummy
+        ORDER BY tanggal_dummy
+    """
+
+
+def daily_movements_params(ranges, status):
+    params = [status]
+    for start, end in ranges:
+        params += [start, end]
+    return tuple(params)
+
+
+# Total movement per tanggal dari snapshot untuk hari-hari yang sudah diekspor:
+# di DuckDB jika backend analitik halaman ini duckdb, selain itu lewat pyarrow
+def _snapshot_daily_movements(days, status):
+    if analytics_backend(PAGE) == "duckdb":
+        ranges = day_ranges(days)
+        return run_analytics(
+            daily_movements_sql(len(ranges)), daily_movements_params(ranges, status), dates=ranges, page=PAGE
+        )
+    rows = read_snapshot(
+        "flights", days, columns=["tanggal_dummy", "DEP_ARR_LOCAL"],
+        filter=equals_filter("STATUS_FLIGHT", status),
+    )
+    rows["total_movement"] = np.where(rows["DEP_ARR_LOCAL"] == "L", 2, 1)
+    return rows.groupby("tanggal_dummy", as_index=False)["total_movement"].sum()
+
+
+# Ambil total movement per tanggal untuk semua rentang
+# Movement dengan DEP_ARR_LOCAL = 'L' dihitung dua kali (sama dengan query2 sebelumnya)
+# Hari yang sudah ada di snapshot dihitung dari snapshot, sisanya (termasuk hari ini) dalam satu query MySQL
+def fetch_daily_movements(ranges, status="REGULER"):
+    snapshot_days, mysql_ranges = [], []
+    for _, start, end in ranges:
+        days, remaining = split_range("flights", start, end)
+        snapshot_days += days
+        mysql_ranges += remaining
+    frames = []
+    if snapshot_days:
+        frames.append(_snapshot_daily_movements(snapshot_days, status))
+    if mysql_ranges:
+        frames.append(run_query(
+            daily_movements_sql(len(mysql_ranges)), daily_movements_params(mysql_ranges, status),
+            dates=mysql_ranges,
+        ))
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True).sort_values("tanggal_dummy", kind="stable")
+
+
+# Susun tabel YoY: satu baris per hari ("01 January"), kolom total_movement_<tahun> dan
+# "Growth <tahun sebelumnya>-<tahun>" untuk setiap pasangan tahun berurutan.
+# Growth dalam persen dibulatkan 1 desimal, 0 jika movement tahun sebelumnya 0.
+def yoy_table(daily, ranges):
+    years = [year for year, _, _ in ranges]
+    tanggal = pd.to_datetime(daily["tanggal_dummy"], errors="coerce")
+    daily = daily.assign(tanggal=tanggal).dropna(subset=["tanggal"])
+
+    # Tahun diambil dari rentang (bukan kalender) agar rentang lintas tahun tetap satu kolom
+    daily["year"] = np.nan
+    for year, start, end in ranges:
+        in_range = (daily["tanggal"] >= pd.Timestamp(start)) & (daily["tanggal"] <= pd.Timestamp(end))
+        daily.loc[in_range, "year"] = year
+    daily = daily.dropna(subset=["year"])
+
+    # Urutkan hari mengikuti rentang (posisi hari sejak awal rentang), bukan urutan abjad label
+    starts = {year: pd.Timestamp(start) for year, start, _ in ranges}
+    daily["order"] = (daily["tanggal"] - daily["year"].map(starts)).dt.days
+    daily["Tanggal"] = daily["tanggal"].dt.strftime("%d %B")
+
+    table = daily.pivot_table(
+        index="Tanggal", columns="year", values="total_movement", aggfunc="sum", fill_value=0
+    ).reindex(columns=years, fill_value=0)
+    order = daily.groupby("Tanggal")["order"].min()
+    table = table.loc[order.sort_values(kind="stable").index]
+    table.columns = [movement_column(year) for year in years]
+    table = table.astype(int)
+
+    for previous_year, year in zip(years, years[1:]):
+        previous = table[movement_column(previous_year)]
+        current = table[movement_column(year)]
+        growth = (current - previous) / previous.where(previous != 0) * 100
+        table[growth_column(previous_year, year)] = growth.fillna(0).round(1)
+    return table.reset_index()
+
+
+# Rata-rata growth per pasangan tahun dari tabel yoy_table
+def average_growth(table, years):
+    years = sorted(years)
+    return {
+        growth_column(previous_year, year): round(table[growth_column(previous_year, year)].mean(), 1)
+        for previous_year, year in zip(years, years[1:])
+    }
+
+
+# Tabel YoY untuk tahun `years` pada satu bulan atau rentang hari
+def yoy_comparison(years, month=None, day_range=None, status="REGULER"):
+    ranges = year_ranges(years, month=month, day_range=day_range)
+    return yoy_table(fetch_daily_movements(ranges, status=status), ranges)